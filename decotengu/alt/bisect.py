@@ -59,16 +59,24 @@ The algorithm finding first decompression stop is
    depth.
 #. Let :math:`dt = t` mod :math:`t_{3m}`.
 #. Let :math:`n = t` div :math:`t_{3m}`.
-#. Using binary search find :math:`k` such that :math:`0 \le k \le n` and
-   ascent by time :math:`k * t_{3m} + dt` is possible without violating
-   ascent ceiling.
+#. Let :math:`k_0` be index of the first decompression stop candidate at
+   depth of current ascent ceiling rounded to depth divisible by 3 (the
+   guess).
+#. If ascent by time :math:`k_0 * t_{3m} + dt` is possible and ascent by
+   time :math:`(k_0 + 1) * t_{3m} + dt` is not possible, then
+   :math:`k = k_0`.
+#. Otherwise, using binary search find largest :math:`k` such that
+   :math:`k_0 < k \le n` (when ascent to the guess is possible) or
+   :math:`0 \le k < k_0` (otherwise) and ascent by time
+   :math:`k * t_{3m} + dt` is possible without violating ascent ceiling.
 #. If :math:`k = 0`, then return absolute pressure of starting depth.
 #. Otherwise, return absolute pressure of depth after ascent by time
    :math:`k * t_{3m} + dt`.
 
 The complexity of the algorithm is :math:`O(log(n))`, where :math:`n` is
 current depth divided by number 3. It depends on complexity of binary
-search algorithm.
+search algorithm. When the guess is the first decompression stop, which is
+the most common case, only two ascent checks are performed.
 
 The algorithm is implemented by
 :py:class:`decotengu.alt.bisect.BisectFindFirstStop` class.
@@ -143,8 +151,28 @@ class BisectFindFirstStop(object):
         f = lambda k, data: \
             engine._can_ascend(start.abs_p, k * ts_3m + dt, start.data)
 
-        # find largest k for which ascent without decompression is possible
-        k = bisect_find(n, f, start.data)
+        # initial guess of first decompression stop is current ascent
+        # ceiling limit quantized to 3m, which is usually first stop or
+        # close to it; k0 is index of the guess within stop candidates
+        limit = engine._ceil_pressure_3m(engine.model.ceiling_limit(start.data))
+        k0 = n - engine._n_stops(max(limit, abs_p), abs_p)
+        k0 = max(0, min(k0, n))
+
+        # find largest k for which ascent without decompression is
+        # possible; check the guess and its shallower neighbour, then
+        # bisect the rest of the range only if necessary
+        if k0 > 0 and f(k0, start.data):
+            if k0 == n or not f(k0 + 1, start.data):
+                k = k0
+            else:
+                lo = k0 + 1
+                fk = lambda k, data: f(lo + k, data)
+                k = lo + bisect_find(n - lo, fk, start.data)
+        else:
+            k = bisect_find(max(k0 - 1, 0), f, start.data)
+
+        if __debug__:
+            logger.debug('find first stop: guess k=%s, found k=%s', k0, k)
 
         if k == 0:
             stop = start
@@ -152,7 +180,7 @@ class BisectFindFirstStop(object):
                 logger.debug('first stop find: already at deco zone')
         else:
             time = k * ts_3m + dt
-            stop = engine._step_next_ascent(start, k * ts_3m + dt, gas)
+            stop = engine._step_next_ascent(start, time, gas)
 
             if __debug__:
                 p = start.abs_p - engine._time_to_pressure(time, engine.ascent_rate)
@@ -76,14 +76,18 @@ and dive profile using decimal type with precision 9
 Check the total time of dive decompression phase
 
     >>> deco_table.total
-    103.0
+    103
     >>> deco_table_dec.total
-    Decimal('103.00000')
+    103
 
 Calculate maximum absolute error of saturation of inert gas in a tissue at
 the surface
 
-    >>> max_error = max(abs(v1[0] - float(v2[0]) + v1[1] - float(v2[1])) for v1, v2 in zip(last.data.tissues, last_dec.data.tissues))
+    >>> tissues = zip(
+    ...     last.data.tissues_n2, last.data.tissues_he,
+    ...     last_dec.data.tissues_n2, last_dec.data.tissues_he
+    ... )
+    >>> max_error = max(abs(v1 - float(v2) + u1 - float(u2)) for v1, u1, v2, u2 in tissues)
     >>> round(max_error, 10)
     1.06134e-05
 
@@ -139,7 +143,8 @@ class DecimalContext(object):
 
         attrs = (
             'WATER_VAPOUR_PRESSURE_DEFAULT', 'LOG_2', 'SURFACE_PRESSURE',
-            'METER_TO_BAR', 'ROUND_VALUE', 'MINUTE', 'DECO_STOP_SEARCH_TIME',
+            'METER_TO_BAR', 'ROUND_VALUE', 'MINUTE',
+            'ASCENT_RATE', 'DESCENT_RATE',
         )
         self._override(self.const, attrs, self.const_data)
         self.const_data['SCALE'] = self.const.SCALE
@@ -33,13 +33,7 @@ EPSILON = 10 ** -SCALE
 ROUND_VALUE = 0.499999
 MINUTE = 1
 TIME_3M = 0.3 # time [min] to ascent/descent at 10m/min
-
-#
-# number based on performance test for dive profile presented in
-# Baker "Deep Stops" paper, see also
-#
-#   decotengu.tests.integration.test_engine.ProfileTestCase.test_deepstop
-#
-DECO_STOP_SEARCH_TIME = 8
+ASCENT_RATE = 10.0 # default ascent rate [m/min]
+DESCENT_RATE = 20.0 # default descent rate [m/min]
 
 # vim: sw=4:et:ai
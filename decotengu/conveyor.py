@@ -123,7 +123,7 @@ class Conveyor(object):
 
         prev = step
         for end in data:
-            if end.phase == 'gas_switch':
+            if end.phase == Phase.GAS_SWITCH:
                 yield end
                 continue
 
@@ -158,12 +158,12 @@ class Conveyor(object):
                     )
 
                 # check nitrogen
-                vt = (v1[0] - v2[0] for v1, v2 in zip(end.data.tissues, stop.data.tissues))
+                vt = (v1 - v2 for v1, v2 in zip(end.data.tissues_n2, stop.data.tissues_n2))
                 dstr = ' '.join(str(v) for v in vt)
                 assert all(abs(v) < EPSILON for v in vt), dstr
 
                 # check helium
-                vt = (v1[1] - v2[1] for v1, v2 in zip(end.data.tissues, stop.data.tissues))
+                vt = (v1 - v2 for v1, v2 in zip(end.data.tissues_he, stop.data.tissues_he))
                 dstr = ' '.join(str(v) for v in vt)
                 assert all(abs(v) < EPSILON for v in vt), dstr
 
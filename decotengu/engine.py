@@ -23,14 +23,14 @@ DecoTengu dive decompression engine.
 [mpdfd] Powell, Mark. Deco for Divers, United Kingdom, 2010
 """
 
-from collections import namedtuple, OrderedDict
+from collections import namedtuple
 import math
 import operator
 import logging
 
 from .model import ZH_L16B_GF
 from .error import ConfigError, EngineError
-from .ft import recurse_while, bisect_find
+from .ft import bisect_find, pairwise
 from .flow import coroutine
 from . import const
 
@@ -67,35 +67,133 @@ class Phase(object):
     GAS_SWITCH = 'gas_switch'
 
 
-Step = namedtuple('Step', 'phase abs_p time gas data')
-Step.__repr__ = lambda s: 'Step(phase="{}", abs_p={:.4f}, time={:.4f},' \
-    ' gf={:.4f})'.format(s.phase, s.abs_p, s.time, s.data.gf)
-Step.__doc__ = """
-Dive step information.
+class Step(object):
+    """
+    Dive step information.
 
-:var phase: Dive phase.
-:var abs_p: Absolute pressure at depth [bar].
-:var time: Time of dive [min].
-:var gas: Gas mix configuration.
-:var data: Decompression model data.
-"""
+    :var phase: Dive phase.
+    :var abs_p: Absolute pressure at depth [bar].
+    :var time: Time of dive [min].
+    :var gas: Gas mix configuration.
+    :var data: Decompression model data.
+    """
+    __slots__ = ('phase', 'abs_p', 'time', 'gas', 'data')
 
-GasMix = namedtuple('GasMix', 'depth o2 n2 he')
-GasMix.__doc__ = """
-Gas mix configuration.
+    def __init__(self, phase, abs_p, time, gas, data):
+        self.phase = phase
+        self.abs_p = abs_p
+        self.time = time
+        self.gas = gas
+        self.data = data
+
+
+    def _replace(self, **kw):
+        """
+        Create copy of the dive step with some of its attributes replaced
+        with new values.
+
+        :param kw: Dive step attributes to replace.
+        """
+        step = Step.__new__(Step)
+        step.phase = kw.pop('phase', self.phase)
+        step.abs_p = kw.pop('abs_p', self.abs_p)
+        step.time = kw.pop('time', self.time)
+        step.gas = kw.pop('gas', self.gas)
+        step.data = kw.pop('data', self.data)
+        assert not kw, 'Unknown dive step attributes {}'.format(kw)
+        return step
+
+
+    def __eq__(self, other):
+        if type(other) is not Step:
+            return NotImplemented
+        return self.phase == other.phase \
+            and self.abs_p == other.abs_p and self.time == other.time \
+            and self.gas == other.gas and self.data == other.data
+
+    __hash__ = None
+
+
+    def __repr__(self):
+        return 'Step(phase="{}", abs_p={:.4f}, time={:.4f}, gf={:.4f})' \
+            .format(self.phase, self.abs_p, self.time, self.data.gf)
+
+
+
+class GasMix(object):
+    """
+    Gas mix configuration.
+
+    The gas mix attributes are read-only.
+
+    :var depth: Gas mix switch depth.
+    :var o2: O2 percentage.
+    :var n2: N2 percentage.
+    :var he: Helium percentage.
+    """
+    __slots__ = ('depth', 'o2', 'n2', 'he')
+
+    def __init__(self, depth, o2, n2, he):
+        set_attr = object.__setattr__
+        set_attr(self, 'depth', depth)
+        set_attr(self, 'o2', o2)
+        set_attr(self, 'n2', n2)
+        set_attr(self, 'he', he)
+
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Gas mix attribute {} is read-only'.format(name))
+
+
+    def __delattr__(self, name):
+        raise AttributeError('Gas mix attribute {} is read-only'.format(name))
+
+
+    def __reduce__(self):
+        return GasMix, (self.depth, self.o2, self.n2, self.he)
+
+
+    def _replace(self, **kw):
+        """
+        Create copy of the gas mix with some of its attributes replaced
+        with new values.
+
+        :param kw: Gas mix attributes to replace.
+        """
+        mix = GasMix(
+            kw.pop('depth', self.depth),
+            kw.pop('o2', self.o2),
+            kw.pop('n2', self.n2),
+            kw.pop('he', self.he),
+        )
+        assert not kw, 'Unknown gas mix attributes {}'.format(kw)
+        return mix
+
+
+    def __eq__(self, other):
+        if type(other) is not GasMix:
+            return NotImplemented
+        return self.depth == other.depth \
+            and self.o2 == other.o2 and self.n2 == other.n2 \
+            and self.he == other.he
+
+
+    def __hash__(self):
+        return hash((self.depth, self.o2, self.n2, self.he))
+
+
+    def __repr__(self):
+        return 'GasMix(depth={}, o2={}, n2={}, he={})'.format(
+            self.depth, self.o2, self.n2, self.he
+        )
 
-:var depth: Gas mix switch depth.
-:var o2: O2 percentage.
-:var n2: N2 percentage.
-:var he: Helium percentage.
-"""
 
 DecoStop = namedtuple('DecoStop', 'depth time')
 DecoStop.__doc__ = """
 Dive decompression stop information.
 
 :var depth: Depth of decompression stop [m].
-:var time: Length of decompression stops [min].
+:var time: Length of decompression stops, integer number of minutes.
 """
 
 
@@ -112,26 +210,75 @@ class Engine(object):
     :var descent_rate: Descent rate during a dive [m/min].
     :var last_stop_6m: If true, then last deco stop is at 6m (not default 3m).
     :var deco_table: List of decompression stops.
-    :var _gas_list: List of gas mixes.
-    :var _deco_stop_search_time: Time limit for decompression stop linear
-        search.
+    :var _gas_list: List of gas mixes - bottom gas mix and decompression
+        gas mixes sorted by switch depth (deepest first).
+    :var _travel_gas_list: List of travel gas mixes sorted by switch depth
+        (shallowest first).
+    :var _meter_to_bar: Meter to bar conversion constant.
+    :var _p3m: Pressure change of 3m depth change [bar].
+    :var _ascent_bar_per_min: Pressure change rate during ascent [bar/min].
+    :var _descent_bar_per_min: Pressure change rate during descent
+        [bar/min].
+    :var _ts_3m: Time of ascent by 3m [min].
     """
     def __init__(self):
         super().__init__()
         self.model = ZH_L16B_GF()
         self.surface_pressure = const.SURFACE_PRESSURE
-        self.ascent_rate = 10.0
-        self.descent_rate = 20.0
         self.last_stop_6m = False
         self.deco_table = DecoTable()
 
         self._gas_list = []
         self._travel_gas_list = []
 
-        self._deco_stop_search_time = const.DECO_STOP_SEARCH_TIME
-
+        self._ascent_rate = const.ASCENT_RATE
+        self._descent_rate = const.DESCENT_RATE
         self._meter_to_bar = const.METER_TO_BAR
         self._p3m = 3 * const.METER_TO_BAR
+        self._update_rates()
+
+
+    @property
+    def ascent_rate(self):
+        """
+        Ascent rate during a dive [m/min].
+        """
+        return self._ascent_rate
+
+
+    @ascent_rate.setter
+    def ascent_rate(self, rate):
+        self._ascent_rate = rate
+        self._update_rates()
+
+
+    @property
+    def descent_rate(self):
+        """
+        Descent rate during a dive [m/min].
+        """
+        return self._descent_rate
+
+
+    @descent_rate.setter
+    def descent_rate(self, rate):
+        self._descent_rate = rate
+        self._update_rates()
+
+
+    def _update_rates(self):
+        """
+        Calculate pressure change rates for ascent and descent and time of
+        ascent by 3m.
+
+        The method is called each time ascent rate or descent rate
+        changes, so the pressure change rates are not calculated for every
+        dive step. Call the method after changing meter to bar conversion
+        constant or pressure of 3m depth change.
+        """
+        self._ascent_bar_per_min = self._ascent_rate * self._meter_to_bar
+        self._descent_bar_per_min = self._descent_rate * self._meter_to_bar
+        self._ts_3m = self._p3m / self._ascent_bar_per_min
 
 
     def _to_pressure(self, depth):
@@ -175,6 +322,18 @@ class Engine(object):
         return pressure / rate / self._meter_to_bar
 
 
+    def _pressure_to_time_ascent(self, pressure):
+        """
+        Convert pressure change into time using ascent rate.
+
+        The returned time is in minutes. The conversion is single division
+        by precalculated ascent pressure change rate.
+
+        :param pressure: Pressure change [bar].
+        """
+        return pressure / self._ascent_bar_per_min
+
+
     def _ceil_pressure_3m(self, abs_p):
         """
         Calculate absolute pressure value, so when converted to meters its
@@ -182,8 +341,9 @@ class Engine(object):
 
         :param abs_p: Input absolute pressure [bar].
         """
-        v = math.ceil((abs_p - self.surface_pressure) / self._p3m)
-        return  v * self._p3m + self.surface_pressure
+        sp = self.surface_pressure
+        p3m = self._p3m
+        return math.ceil((abs_p - sp) / p3m) * p3m + sp
 
 
     def _n_stops(self, start_abs_p, end_abs_p=None):
@@ -214,7 +374,7 @@ class Engine(object):
         :param abs_p: Absolute pressure of current depth.
         :param data: Decompression model data.
         """
-        return abs_p >= self.model.ceiling_limit(data)
+        return self.model.within_ceiling_limit(abs_p, data)
 
 
     def _can_ascend(self, abs_p, time, data, gf=None):
@@ -227,8 +387,8 @@ class Engine(object):
         :param data: Decompression model data.
         :param gf: Gradient factor to be used for ceiling check.
         """
-        p = abs_p - self._time_to_pressure(time, self.ascent_rate)
-        return p >= self.model.ceiling_limit(data, gf=gf)
+        p = abs_p - time * self._ascent_bar_per_min
+        return self.model.within_ceiling_limit(p, data, gf)
 
 
     def _step_start(self, abs_p, gas):
@@ -275,7 +435,7 @@ class Engine(object):
         :param phase: Dive phase.
         """
         data = self._tissue_pressure_descent(step.abs_p, time, gas, step.data)
-        pressure = step.abs_p + self._time_to_pressure(time, self.descent_rate)
+        pressure = step.abs_p + time * self._descent_bar_per_min
         return Step(phase, pressure, step.time + time, gas, data)
 
 
@@ -294,7 +454,7 @@ class Engine(object):
         :param phase: Dive phase.
         """
         data = self._tissue_pressure_ascent(step.abs_p, time, gas, step.data)
-        pressure = step.abs_p - self._time_to_pressure(time, self.ascent_rate)
+        pressure = step.abs_p - time * self._ascent_bar_per_min
         if gf is not None:
             # FIXME: make it model independent
             data = data._replace(gf=gf)
@@ -323,7 +483,7 @@ class Engine(object):
         :param gas: Gas mix configuration.
         :param data: Decompression model data.
         """
-        rate = self.descent_rate * self._meter_to_bar
+        rate = self._descent_bar_per_min
         data = self.model.load(abs_p, time, gas, rate, data)
         return data
 
@@ -337,7 +497,7 @@ class Engine(object):
         :param gas: Gas mix configuration.
         :param data: Decompression model data.
         """
-        rate = -self.ascent_rate * self._meter_to_bar
+        rate = -self._ascent_bar_per_min
         tp = self.model.load(abs_p, time, gas, rate, data)
         return tp
 
@@ -348,9 +508,9 @@ class Engine(object):
 
         The switch results in new dive step.
         """
-        step = step._replace(phase=Phase.GAS_SWITCH, gas=gas)
+        step = Step(Phase.GAS_SWITCH, step.abs_p, step.time, gas, step.data)
         if __debug__:
-            logger.debug('switched to gas mix {} at {}'.format(gas, step))
+            logger.debug('switched to gas mix %s at %s', gas, step)
         return step
 
 
@@ -384,7 +544,8 @@ class Engine(object):
             step = self._switch_gas(step, last)
             yield step
 
-        logger.debug('descent finished at {:.4f}bar'.format(step.abs_p))
+        if __debug__:
+            logger.debug('descent finished at %.4fbar', step.abs_p)
 
 
     def _dive_ascent(self, start, gas_list):
@@ -400,6 +561,10 @@ class Engine(object):
         - ascent to first decompression stop
         - ascent performing decompression stops
 
+        The method returns list of dive steps. The ascent is short part of
+        a dive, so dive steps are not generated one by one to avoid
+        overhead of nested generators.
+
         :param start: Starting dive step.
         :param gas_list: List of gas mixes - bottom and decompression gas
             mixes.
@@ -408,21 +573,19 @@ class Engine(object):
         bottom_gas = gas_list[0]
         step = self._ndl_ascent(start, bottom_gas)
         if step:
-            yield step
-            return
-
-        step = start
+            return [step]
 
         stages = self._free_ascent_stages(gas_list)
-        for step in self._free_staged_ascent(step, stages):
-            yield step
+        steps = self._free_staged_ascent(start, stages)
+        step = steps[-1] if steps else start
 
         # we should not arrive at the surface - it is non-ndl dive at this
         # stage
         assert not abs(step.abs_p - self.surface_pressure) < const.EPSILON
 
         stages = self._deco_ascent_stages(step.abs_p, gas_list)
-        yield from self._deco_staged_ascent(step, stages)
+        steps.extend(self._deco_staged_ascent(step, stages))
+        return steps
 
 
     def _ndl_ascent(self, start, gas):
@@ -447,7 +610,7 @@ class Engine(object):
 
         gf = self.model.gf_high
         p = start.abs_p - self.surface_pressure
-        time = self._pressure_to_time(p, self.ascent_rate)
+        time = self._pressure_to_time_ascent(p)
         step = self._step_next_ascent(start, time, gas, gf=gf)
         limit = self.model.ceiling_limit(step.data, gf)
         if step.abs_p < limit:
@@ -493,24 +656,24 @@ class Engine(object):
         limit = model.ceiling_limit(step.data, step.data.gf)
         limit = self._ceil_pressure_3m(limit)
         limit = max(abs_p, limit)
-        t = self._pressure_to_time(step.abs_p - limit, self.ascent_rate)
+        t = self._pressure_to_time_ascent(step.abs_p - limit)
 
         if __debug__:
             logger.debug(
-                'find first stop: check ascent from {}bar by {}min to {}bar (start)'
-                .format(step.abs_p, t, limit)
+                'find first stop: check ascent from %sbar by %smin to %sbar'
+                ' (start)', step.abs_p, t, limit
             )
         while step.abs_p > limit and step.abs_p > abs_p:
             step = self._step_next_ascent(step, t, gas)
             limit = model.ceiling_limit(step.data, step.data.gf)
             limit = self._ceil_pressure_3m(limit)
             limit = max(abs_p, limit)
-            t = self._pressure_to_time(step.abs_p - limit, self.ascent_rate)
+            t = self._pressure_to_time_ascent(step.abs_p - limit)
 
             if __debug__:
                 logger.debug(
-                    'find first stop: check ascent from {}bar by {}min to {}bar'
-                    .format(step.abs_p, t, limit)
+                    'find first stop: check ascent from %sbar by %smin to %sbar',
+                    step.abs_p, t, limit
                 )
 
         stop = step
@@ -525,13 +688,14 @@ class Engine(object):
             if start is stop:
                 logger.debug('find first stop: at first deco stop already')
             elif stop.abs_p > abs_p:
-                limit = self.model.ceiling_limit(stop.data)
-                logger.debug(
-                    'find first stop: found at {}m ({}bar), ascent time={},'
-                    ' limit={}'.format(
-                        depth, stop.abs_p, stop.time - start.time, limit
+                # calculate ceiling limit only if it is going to be logged
+                if logger.isEnabledFor(logging.DEBUG):
+                    limit = self.model.ceiling_limit(stop.data)
+                    logger.debug(
+                        'find first stop: found at %sm (%sbar), ascent'
+                        ' time=%s, limit=%s', depth, stop.abs_p,
+                        stop.time - start.time, limit
                     )
-                )
             else:
                 logger.debug('find first stop: no decompression stop found')
 
@@ -544,7 +708,8 @@ class Engine(object):
         """
         Calculate stages for dive descent.
 
-        Descent stage is a tuple
+        The method returns tuple of descent stages. Descent stage is
+        a tuple
 
         - absolute pressure of destination depth
         - gas mix
@@ -566,19 +731,20 @@ class Engine(object):
         :param end_abs_p: Absolute pressure of destination depth.
         :param gas_list: List of gas mixes - travel and bottom gas mixes.
         """
-        mixes = zip(gas_list[:-1], gas_list[1:])
+        mixes = pairwise(gas_list)
         _pressure = lambda mix: self._to_pressure(mix.depth)
-        yield from ((_pressure(m2), m1) for m1, m2 in mixes)
+        stages = tuple((_pressure(m2), m1) for m1, m2 in mixes)
         last = gas_list[-1]
         if abs(_pressure(last) - end_abs_p) > 0:
-            yield (end_abs_p, last)
+            stages += ((end_abs_p, last),)
+        return stages
 
 
     def _free_ascent_stages(self, gas_list):
         """
         Calculate stages for deco-free ascent.
 
-        Ascent stage is a tuple
+        The method returns tuple of ascent stages. Ascent stage is a tuple
 
         - absolute pressure of destination depth
         - gas mix
@@ -594,18 +760,18 @@ class Engine(object):
         :param gas_list: List of gas mixes - bottom and decompression gas
             mixes.
         """
-        mixes = zip(gas_list[:-1], gas_list[1:])
+        mixes = pairwise(gas_list)
         _pressure = lambda mix: \
             self._to_pressure(((mix.depth - 1) // 3 + 1) * 3)
-        yield from ((_pressure(m2), m1) for m1, m2 in mixes)
-        yield (self.surface_pressure, gas_list[-1])
+        stages = tuple((_pressure(m2), m1) for m1, m2 in mixes)
+        return stages + ((self.surface_pressure, gas_list[-1]),)
 
 
     def _deco_ascent_stages(self, start_abs_p, gas_list):
         """
         Calculate stages for decompression ascent.
 
-        Ascent stage is a tuple
+        The method returns tuple of ascent stages. Ascent stage is a tuple
 
         - absolute pressure of destination depth
         - gas mix
@@ -626,13 +792,13 @@ class Engine(object):
         :param start_abs_p: Absolute pressure of decompression start depth.
         """
         assert start_abs_p > self.surface_pressure
-        mixes = zip(gas_list[:-1], gas_list[1:])
+        mixes = pairwise(gas_list)
         _pressure = lambda mix: self._to_pressure(mix.depth // 3 * 3)
-        yield from (
+        stages = tuple(
             (_pressure(m2), m1) for m1, m2 in mixes
             if self._to_pressure(m2.depth) < start_abs_p
         )
-        yield (self.surface_pressure, gas_list[-1])
+        return stages + ((self.surface_pressure, gas_list[-1]),)
 
 
     def _validate_gas_list(self, depth):
@@ -660,27 +826,29 @@ class Engine(object):
         if not self._travel_gas_list and self._gas_list[0].depth != 0:
             raise ConfigError('Bottom gas mix switch depth is not 0m')
 
-        k = len(self._travel_gas_list)
-        depths = (m.depth for m in self._travel_gas_list)
-        if k and len(set(depths)) != k:
+        # gas mix lists are kept sorted by switch depth by add_gas
+        # method, so gas mixes with the same switch depth are adjacent
+        # and deepest and shallowest gas mixes are at the ends of the
+        # lists
+        travel_list = self._travel_gas_list
+        deco_list = self._gas_list[1:]
+
+        if any(m1.depth == m2.depth for m1, m2 in pairwise(travel_list)):
             raise ConfigError(
                 'Two or more travel gas mixes have the same switch depth'
             )
 
-        k = len(self._gas_list[1:])
-        depths = [m.depth for m in self._gas_list[1:]]
-        if len(set(depths)) != k:
+        if any(m1.depth == m2.depth for m1, m2 in pairwise(deco_list)):
             raise ConfigError(
                 'Two or more decompression gas mixes have the same'
                 ' switch depth'
             )
 
-        if any(d == 0 for d in depths):
+        if deco_list and deco_list[-1].depth == 0:
             raise ConfigError('Decompression gas mix switch depth is 0m')
 
-        mixes = self._gas_list + self._travel_gas_list
-        mixes = [m for m in mixes if m.depth > depth]
-        if mixes:
+        mixes = self._gas_list[:2] + travel_list[-1:]
+        if any(m.depth > depth for m in mixes):
             raise ConfigError(
                 'Gas mix switch depth deeper than maximum dive depth'
             )
@@ -711,20 +879,23 @@ class Engine(object):
         :param gas: Gas to switch to.
         """
         gp = self._to_pressure(gas.depth)
-        logger.debug('ascent gas switch to {} at {}bar'.format(gas, step.abs_p))
-        assert step.abs_p - gp < self._p3m
-        if abs(step.abs_p - gp) < const.EPSILON:
+        if __debug__:
+            logger.debug('ascent gas switch to %s at %sbar', gas, step.abs_p)
+        assert -const.EPSILON < step.abs_p - gp < self._p3m
+        # dive step is never shallower than gas mix switch depth, so
+        # comparison of the difference is enough
+        if step.abs_p - gp < const.EPSILON:
             steps = (self._switch_gas(step, gas),)
         else:
             assert step.abs_p > gp
 
-            time = self._pressure_to_time(step.abs_p - gp, self.ascent_rate)
+            time = self._pressure_to_time_ascent(step.abs_p - gp)
             s1 = self._step_next_ascent(step, time, step.gas)
 
             s2 = self._switch_gas(s1, gas)
 
             p = self._to_pressure(gas.depth // 3 * 3)
-            time = self._pressure_to_time(s2.abs_p - p, self.ascent_rate)
+            time = self._pressure_to_time_ascent(s2.abs_p - p)
             s3 = self._step_next_ascent(s2, time, gas)
 
             steps = (s1, s2, s3)
@@ -735,22 +906,25 @@ class Engine(object):
         """
         Perform staged ascent until first decompression stop.
 
+        The method returns list of dive steps.
+
         :param start: Starting dive step.
         :param stages: Dive stages.
 
         .. seealso:: :func:`decotengu.Engine._free_ascent_stages`
         """
+        steps = []
         step = start
         for depth, gas in stages:
             if step.gas != gas: # first step might not need gas switch
                 # if gas switch drives us into deco zone, then stop ascent
                 # leaving `step` as first decompression stop
                 if __debug__:
-                    logger.debug('attempt to switch gas {} at {}'.format(gas, step))
+                    logger.debug('attempt to switch gas %s at %s', gas, step)
                 gs_steps = self._ascent_switch_gas(step, gas)
                 if self._inv_limit(gs_steps[-1].abs_p, gs_steps[-1].data):
                     step = gs_steps[-1]
-                    yield from gs_steps
+                    steps.extend(gs_steps)
                     if __debug__:
                         logger.debug('gas switch performed')
                 else:
@@ -765,57 +939,77 @@ class Engine(object):
                 break # already at deco zone
             else:
                 step = s
-                yield step
-                if abs(step.abs_p - depth) > const.EPSILON: # deco stop found
+                steps.append(step)
+                # first stop is never shallower than target depth
+                if step.abs_p - depth > const.EPSILON: # deco stop found
                     break
                 # else: at target depth of ascent stage without deco stop,
                 #       so move to next stage
 
+        return steps
+
 
     def _deco_staged_ascent(self, start, stages):
         """
         Perform staged asccent within decompression zone.
 
+        The method returns list of dive steps.
+
         :param start: Starting dive step.
         :param stages: Dive stages.
 
         .. seealso:: :func:`decotengu.Engine._ascent_stages_deco`
         """
-        if __debug__:
-            depth = self._to_depth(start.abs_p)
-            assert depth % 3 == 0 and depth > 0, depth
+        # decompression stops are 3m apart, so convert pressure of first
+        # stop into depth once and track depth of next stops by
+        # subtraction
+        stop_depth = self._to_depth(start.abs_p)
+        assert stop_depth % 3 == 0 and stop_depth > 0, stop_depth
 
         bottom_gas = self._gas_list[0]
         stages = self._deco_stops(start, stages)
+        steps = []
+        deco_stops = []
         step = start
+        stage_gas = None
         for depth, gas, time, gf in stages:
+            # gas mix changes once per ascent stage, so calculate gas mix
+            # switch depth pressure once for all its decompression stops
+            if gas is not stage_gas:
+                stage_gas = gas
+                can_switch = gas != bottom_gas
+                gas_p = self._to_pressure(gas.depth)
+
             # switch gas
-            if step.abs_p >= self._to_pressure(gas.depth) and gas != bottom_gas:
-                for step in self._ascent_switch_gas(step, gas):
-                    yield step
+            if can_switch and step.abs_p >= gas_p:
+                gs_steps = self._ascent_switch_gas(step, gas)
+                steps.extend(gs_steps)
+                step = gs_steps[-1]
 
             # execute deco stop
             end = self._deco_stop(step, time, gas, gf)
-            self.deco_table.append(
-                self._to_depth(step.abs_p),
-                end.time - step.time
-            )
+            deco_stops.append((stop_depth, end.time - step.time))
+            stop_depth -= 3
             step = end
-            yield step
+            steps.append(step)
 
             # ascend to next deco stop
             step = self._step_next_ascent(step, time, gas, gf=gf)
-            yield step
+            steps.append(step)
+
+        self.deco_table.extend(deco_stops)
 
         if __debug__:
-            logger.debug('deco engine: gf at surface={:.4f}'.format(step.data.gf))
+            logger.debug('deco engine: gf at surface=%.4f', step.data.gf)
+
+        return steps
 
 
     def _deco_stops(self, step, stages):
         """
         Calculate collection of decompression stops.
 
-        The method returns collection of tuples
+        The method returns list of tuples
 
         - destination depth (see :func:`decotengu.Engine._deco_ascent_stages`
           method)
@@ -824,33 +1018,50 @@ class Engine(object):
           required to ascent by 3m)
         - gradient factor value for next decompression stop or surface
 
+        The decompression stops of each ascent stage are calculated at
+        once. The decompression stops are identified by their index, which
+        is amount of decompression stops between a stop and the surface,
+        i.e. 6m decompression stop has index 2. Therefore, amount of
+        decompression stops of an ascent stage and position of 6m stop (if
+        last decompression stop is at 6m) are calculated with integer
+        arithmetic and no pressure comparison is performed for each
+        decompression stop.
+
         :param step: Current dive step.
         :param stages: Decompression ascent stages.
 
         .. seealso:: :func:`decotengu.Engine._deco_ascent_stages`
         """
-        k = self._n_stops(step.abs_p)
-        gf_step = (self.model.gf_high - self.model.gf_low) / k
-        ts_3m = self._pressure_to_time(self._p3m, self.ascent_rate)
+        i = self._n_stops(step.abs_p)
+        gf_step = (self.model.gf_high - self.model.gf_low) / i
+        ts_3m = self._ts_3m
         gf = step.data.gf
 
         if __debug__:
-            logger.debug('deco engine: gf step={:.4}'.format(gf_step))
+            logger.debug('deco engine: gf step=%.4f', gf_step)
 
-        abs_p = step.abs_p
-        stop_at_6m = self.surface_pressure + 2 * self._p3m
-        ls_6m = self.last_stop_6m
+        stops = []
         for depth, gas in stages:
-            n = self._n_stops(abs_p, depth)
-            for k in range(n):
+            k = self._n_stops(depth)
+            n = i - k
+
+            # ascent stage with 6m deco stop is finished with the stop
+            ls_6m = self.last_stop_6m and k < 2 <= i
+            if ls_6m:
+                n = i - 2
+
+            for _ in range(n):
                 gf += gf_step
-                if ls_6m and abs(abs_p - k * self._p3m - stop_at_6m) < const.EPSILON:
-                    yield depth, gas, 2 * ts_3m, gf + gf_step
-                    assert abs(self.model.gf_high - gf - gf_step) < const.EPSILON
-                    break
-                else:
-                    yield depth, gas, ts_3m, gf
-            abs_p = depth
+                stops.append((depth, gas, ts_3m, gf))
+
+            if ls_6m:
+                gf += gf_step
+                stops.append((depth, gas, 2 * ts_3m, gf + gf_step))
+                assert abs(self.model.gf_high - gf - gf_step) < const.EPSILON
+
+            i = k
+
+        return stops
 
 
     def _deco_stop(self, step, next_time, gas, gf):
@@ -868,49 +1079,104 @@ class Engine(object):
         """
         if __debug__:
             depth = self._to_depth(step.abs_p)
-            logger.debug('deco stop: calculate at {}m'.format(depth))
+            logger.debug('deco stop: calculate at %sm', depth)
             assert depth % 3 == 0 and depth > 0, depth
 
+        # every probe of decompression stop length loads tissues and checks
+        # ascent with the engine methods, so they can be overridden, i.e.
+        # by the alternative algorithms
+        abs_p = step.abs_p
+        tissue_pressure = self._tissue_pressure_const
+        can_ascend = self._can_ascend
+
+        # the length of the decompression stop is bracketed by `time`, at
+        # which ascent is not possible, and `hi`, at which ascent is
+        # possible (if known); `data` is decompression model data at
+        # `time`
+        time = 0
+        data = step.data
+        hi = hi_data = None
+
+        # estimate length of the decompression stop with decompression
+        # model, then check the estimation and its neighbour minute; in
+        # most cases no further search is needed, otherwise the probes
+        # narrow the bracket for the search below
+        limit = abs_p - next_time * self._ascent_bar_per_min
+        estimate = self.model.ceiling_time(abs_p, gas, step.data, limit, gf)
+        if estimate is not None:
+            k = max(const.MINUTE, math.ceil(estimate))
+            d_k = tissue_pressure(abs_p, k, gas, step.data)
+            if can_ascend(abs_p, next_time, d_k, gf):
+                hi, hi_data = k, d_k
+                # the stop is k minutes long unless ascent is possible
+                # a minute earlier
+                if k > const.MINUTE:
+                    k -= 1
+                    d_k = tissue_pressure(abs_p, k, gas, step.data)
+                    if can_ascend(abs_p, next_time, d_k, gf):
+                        hi, hi_data = k, d_k
+                    else:
+                        time, data = k, d_k
+            else:
+                time, data = k, d_k
+                k += 1
+                d_k = tissue_pressure(abs_p, k, gas, step.data)
+                if can_ascend(abs_p, next_time, d_k, gf):
+                    hi, hi_data = k, d_k
+                else:
+                    time, data = k, d_k
+
+            if hi == time + 1:
+                return Step(
+                    Phase.DECO_STOP, abs_p, step.time + hi, gas, hi_data
+                )
+
+            if __debug__:
+                logger.debug(
+                    'deco stop: estimation failed, range (%s, %s)min',
+                    time, hi
+                )
+
         # there are a lot of 1 minute deco stops, so check if we can ascend
         # after 1 minute first; otherwise continue searching for the
         # decompression stop length
-        data = self._tissue_pressure_const(
-            step.abs_p, const.MINUTE, gas, step.data
-        )
-        if self._can_ascend(step.abs_p, next_time, data, gf):
-            return Step(
-                Phase.DECO_STOP, step.abs_p, step.time + const.MINUTE, gas, data
-            )
-
-        max_time = self._deco_stop_search_time
-        # next_f(arg=(time, data)): (time, data) <- track both time and deco
-        # data
-        next_f = lambda time, data: (
-            time + max_time,
-            self._tissue_pressure_const(step.abs_p, max_time, gas, data)
-        )
-        inv_f = lambda time, data: \
-            not self._can_ascend(step.abs_p, next_time, data, gf)
+        if time == 0:
+            data = tissue_pressure(abs_p, const.MINUTE, gas, step.data)
+            if can_ascend(abs_p, next_time, data, gf):
+                return Step(
+                    Phase.DECO_STOP, abs_p, step.time + const.MINUTE, gas, data
+                )
+            time = const.MINUTE
+
+        # ascent is not possible after `time`; if the end of the bracket is
+        # not known, then double the time interval until ascent is possible
+        # at its end, so the decompression stop length is bracketed with
+        # logarithmic number of ascent checks
+        if hi is None:
+            dt = 1 # integer number of minutes for the binary search
+            next_data = tissue_pressure(abs_p, dt, gas, data)
+            while not can_ascend(abs_p, next_time, next_data, gf):
+                time += dt
+                data = next_data
+                dt *= 2
+                next_data = tissue_pressure(abs_p, dt, gas, data)
+            hi = time + dt
 
-        time, data = recurse_while(inv_f, next_f, const.MINUTE, data)
+            if __debug__:
+                logger.debug(
+                    'deco stop: exponential search finished at %smin,'
+                    ' range %smin', time, dt
+                )
 
-        if __debug__:
-            logger.debug(
-                'deco stop: linear find finished after {}min'.format(time)
-            )
-            logger.debug('deco stop: deco data {}'.format(data))
+        # should we stay at deco stop? start with `data` at the beginning
+        # of the range, so no need to add `time`
+        exec_deco_stop = lambda k: not can_ascend(
+            abs_p, next_time, tissue_pressure(abs_p, k, gas, data), gf
+        )
 
-        # start with `data` returned by `recurse_while`, so no need to add
-        # `time`
-        next_f = lambda k: self._tissue_pressure_const(step.abs_p, k, gas, data)
-        # should we stay at deco stop?
-        exec_deco_stop = lambda k: \
-            not self._can_ascend(step.abs_p, next_time, next_f(k), gf)
-
-        # ascent is possible after self._deco_stop_search_time, so
-        # check for self._deco_stop_search_time - 1
-        n = self._deco_stop_search_time - 1
-        k = bisect_find(n, exec_deco_stop)
+        # ascent is possible at `hi`, so check up to a minute earlier; the
+        # range has to be an integer, even if decimal data type is used
+        k = bisect_find(int(hi - time) - 1, exec_deco_stop)
         k += 1 # at k diver should still stay at deco stop as
                # exec_deco_stop is true - ascent minute later
 
@@ -919,10 +1185,10 @@ class Engine(object):
 
         if __debug__:
             logger.debug(
-                'deco stop: search completed {}bar, {}min, n2={.n2}%,'
-                ' gf={:.4}, next gf={:.4}'.format(
-                    step.abs_p, time, gas, step.data.gf, gf
-                ))
+                'deco stop: search completed %sbar, %smin, n2=%s%%,'
+                ' gf=%.4f, next gf=%.4f',
+                step.abs_p, time, gas.n2, step.data.gf, gf
+            )
             assert time % 1 == 0 and time > 0, time
 
         step = self._step_next(step, time, gas, phase=Phase.DECO_STOP)
@@ -946,10 +1212,20 @@ class Engine(object):
 
         .. seealso:: :func:`decotengu.Engine._validate_gas_list`
         """
+        # keep gas mix lists sorted in order used by dive profile
+        # calculation, so they are not sorted for every dive
+        depth_key = operator.attrgetter('depth')
+        mix = GasMix(depth, o2, 100 - o2 - he, he)
         if travel:
-            self._travel_gas_list.append(GasMix(depth, o2, 100 - o2 - he, he))
+            self._travel_gas_list.append(mix)
+            self._travel_gas_list.sort(key=depth_key)
+        elif self._gas_list:
+            # first gas mix is bottom gas mix, sort decompression gas mixes
+            self._gas_list[1:] = sorted(
+                self._gas_list[1:] + [mix], key=depth_key, reverse=True
+            )
         else:
-            self._gas_list.append(GasMix(depth, o2, 100 - o2 - he, he))
+            self._gas_list.append(mix)
 
 
     def calculate(self, depth, time, descent=True):
@@ -973,11 +1249,10 @@ class Engine(object):
         del self.deco_table[:]
         self._validate_gas_list(depth)
 
-        # prepare travel and bottom gas mixes
-        depth_key = operator.attrgetter('depth')
+        # prepare travel and bottom gas mixes; travel gas mixes are sorted
+        # by switch depth already
         bottom_gas = self._gas_list[0]
-        gas_list = sorted(self._travel_gas_list, key=depth_key)
-        gas_list.append(bottom_gas)
+        gas_list = self._travel_gas_list + [bottom_gas]
 
         abs_p = self._to_pressure(depth)
         if descent:
@@ -987,10 +1262,9 @@ class Engine(object):
             step = self._step_start(abs_p, bottom_gas)
             yield step
 
-        # prepare decompression gases, first gas mix is assumed to be
-        # bottom gas mix
-        gas_list = sorted(self._gas_list[1:], key=depth_key, reverse=True)
-        gas_list.insert(0, bottom_gas)
+        # prepare decompression gases, first gas mix is bottom gas mix and
+        # decompression gas mixes are sorted by switch depth already
+        gas_list = list(self._gas_list)
 
         t = time - step.time
         if t <= 0:
@@ -998,7 +1272,7 @@ class Engine(object):
 
         if __debug__:
             logger.debug(
-                'bottom time {}min (descent is {}min)'.format(t, step.time)
+                'bottom time %smin (descent is %smin)', t, step.time
             )
         assert t > 0
         step = self._step_next(step, t, bottom_gas)
@@ -1014,16 +1288,28 @@ class DecoTable(list):
 
     The class is a list of decompression stops.
 
-    The decompression stops time is in minutes.
+    The decompression stops time is integer number of minutes when a
+    decompression stop lasts whole number of minutes.
+
+    The total decompression time is updated when decompression stops are
+    added, so it is not calculated each time it is read. Any other change
+    of the list recalculates it.
 
     .. seealso:: :class:`decotengu.engine.DecoStop`
+
+    :var _total: Total decompression time.
     """
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._total = sum(s.time for s in self)
+
+
     @property
     def total(self):
         """
         Total decompression time.
         """
-        return sum(s.time for s in self)
+        return self._total
 
 
     def append(self, depth, time):
@@ -1034,19 +1320,102 @@ class DecoTable(list):
         :param time: Time of decompression stop [min].
         """
         if __debug__:
-            logger.debug(
-                'deco table: adding {}m {}min stop'.format(depth, time)
-            )
+            logger.debug('deco table: adding %sm %smin stop', depth, time)
 
-        time = round(time, const.SCALE)
-        stop = DecoStop(depth, time)
+        stop = self._stop(depth, time)
 
         assert stop.time > 0
         assert stop.depth > 0
 
         super().append(stop)
+        self._total += stop.time
+        if __debug__:
+            logger.debug('deco table: added %s', stop)
+
+
+    def extend(self, stops):
+        """
+        Add collection of decompression stops.
+
+        :param stops: Collection of pairs - depth [m] and time [min] of
+            each decompression stop.
+        """
+        stop = self._stop
+        stops = [stop(depth, time) for depth, time in stops]
+
+        assert all(s.time > 0 and s.depth > 0 for s in stops)
+
+        super().extend(stops)
+        self._total += sum(s.time for s in stops)
         if __debug__:
-            logger.debug('deco table: added {}'.format(stop))
+            logger.debug('deco table: added %s', stops)
+
+
+    def insert(self, index, stop):
+        super().insert(index, stop)
+        self._update_total()
+
+
+    def pop(self, index=-1):
+        stop = super().pop(index)
+        self._update_total()
+        return stop
+
+
+    def remove(self, stop):
+        super().remove(stop)
+        self._update_total()
+
+
+    def clear(self):
+        super().clear()
+        self._update_total()
+
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._update_total()
+
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._update_total()
+
+
+    def __iadd__(self, stops):
+        super().__iadd__(stops)
+        self._update_total()
+        return self
+
+
+    def __imul__(self, n):
+        super().__imul__(n)
+        self._update_total()
+        return self
+
+
+    def _stop(self, depth, time):
+        """
+        Create decompression stop.
+
+        The time of decompression stop is rounded to remove error of time
+        calculations. Decompression stop, which lasts whole number of
+        minutes, has integer time.
+
+        :param depth: Depth of decompression stop [m].
+        :param time: Time of decompression stop [min].
+        """
+        time = round(time, const.SCALE)
+        if time % 1 == 0:
+            time = int(time)
+        return DecoStop(depth, time)
+
+
+    def _update_total(self):
+        """
+        Recalculate total decompression time.
+        """
+        self._total = sum(s.time for s in self)
 
 
 # vim: sw=4:et:ai
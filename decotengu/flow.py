@@ -45,10 +45,12 @@ def split(*tc):
 
     :param tc: List of target coroutines.
     """
+    # look up send method of each target coroutine once
+    sends = tuple(c.send for c in tc)
     while True:
         v = yield
-        for c in tc:
-            c.send(v)
+        for send in sends:
+            send(v)
 
 
 def sender(gen, *tf):
@@ -64,10 +66,13 @@ def sender(gen, *tf):
     """
     @wraps(gen)
     def _send(*a, **kw):
-        t = split(*[c() for c in tf])
+        # send data to the coroutines directly, so no intermediate split
+        # coroutine is resumed for each value
+        sends = tuple(c().send for c in tf)
         data = gen(*a, **kw)
         for v in data:
-            t.send(v)
+            for send in sends:
+                send(v)
             yield v
     return _send
 
@@ -43,7 +43,7 @@ def recurse_while(predicate, f, *args):
         result = result if type(result) == tuple else (result, )
 
         if __debug__:
-            logger.debug('next result: {}'.format(result))
+            logger.debug('next result: %s', result)
 
     return args if len(args) > 1 else args[0]
 
@@ -53,7 +53,7 @@ def bisect_find(n, f, *args, **kw):
     Find largest `k` for which `f(k)` is true.
 
     The k is integer in range 1 <= k <= n.  If there is no `k` for which
-    `f(k)` is true, then return `0`.
+    `f(k)` is true, then return `0`. The `n` has to be an integer.
 
     :param n: Range for `k`, so :math:`1 <= k <= n`.
     :param f: Invariant function accepting `k`.
@@ -63,13 +63,13 @@ def bisect_find(n, f, *args, **kw):
     lo = 1
     hi = n + 1
     if __debug__:
-        logger.debug('bisect n: {}'.format(n))
+        logger.debug('bisect n: %s', n)
 
     while lo < hi:
-        k = (lo + hi) // 2
+        k = (lo + hi) >> 1
 
         if __debug__:
-            logger.debug('bisect range: {} <= {} <= {}'.format(lo, k, hi))
+            logger.debug('bisect range: %s <= %s <= %s', lo, k, hi)
             assert lo <= k <= hi, 'bisect range: {} <= {} <= {}'.format(lo, k, hi)
 
         if f(k, *args, **kw):
@@ -80,5 +80,19 @@ def bisect_find(n, f, *args, **kw):
     return hi - 1 # hi is first k for which f(k) is not true, so f(hi - 1) is true
 
 
+def pairwise(items):
+    """
+    Iterate over pairs of consecutive items of a sequence.
+
+    For example, sequence `(a, b, c)` gives pairs `(a, b)` and `(b, c)`.
+    The sequence is not copied.
+
+    :param items: Sequence of items.
+    """
+    it = iter(items)
+    next(it, None)
+    return zip(items, it)
+
+
 # vim: sw=4:et:ai
 
@@ -213,13 +213,13 @@ compartment for above dive profile using :py:class:`ZH_L16B_GF` class
     >>> ean32 = GasMix(0, 32, 68, 0)
     >>> data = model.init(1)
     >>> data = model.load(1, 1.5, ean32, 2, data)
-    >>> round(data.tissues[0][0], 6)
+    >>> round(data.tissues_n2[0], 6)
     0.919397
     >>> data = model.load(4, 20, ean32, 0, data)
-    >>> round(data.tissues[0][0], 6)
+    >>> round(data.tissues_n2[0], 6)
     2.567491
     >>> data  = model.load(4, 2, ean32, -1, data)
-    >>> round(data.tissues[0][0], 6)
+    >>> round(data.tissues_n2[0], 6)
     2.42184
 
 The relationship between dive time, absolute pressure of dive depth and
@@ -372,7 +372,7 @@ References
   source code <https://bitbucket.org/heinrichsweikamp/ostc2_code>`_.
 """
 
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 import math
 import logging
 
@@ -382,12 +382,17 @@ from .flow import coroutine
 
 logger = logging.getLogger(__name__)
 
-Data = namedtuple('Data', 'tissues gf')
+Data = namedtuple('Data', 'tissues_n2 tissues_he gf')
 Data.__doc__ = """
 Data for ZH-L16-GF decompression model.
 
-:var tissues: Tissues gas loading. Tuple of pair numbers - each pair holds
-    value of inert gas pressure (N2, He) in a tissue compartment.
+The tissues gas loading is stored per inert gas, so each inert gas
+pressure collection can be processed in a single pass.
+
+:var tissues_n2: Tissues nitrogen loading. Tuple of numbers - each number
+    is pressure of nitrogen in a tissue compartment.
+:var tissues_he: Tissues helium loading. Tuple of numbers - each number
+    is pressure of helium in a tissue compartment.
 :var gf: Gradient factor value.
 """
 
@@ -408,10 +413,67 @@ def eq_gf_limit(gf, p_n2, p_he, a_n2, b_n2, a_he, b_he):
     :param b_he: Helium Buhlmann coefficient B.
     """
     assert gf > 0 and gf <= 1.5
-    p = p_n2 + p_he
-    a = (a_n2 * p_n2 + a_he * p_he) / p
-    b = (b_n2 * p_n2 + b_he * p_he) / p
-    return (p - a * gf) / (gf / b + 1 - gf)
+    coefficients = _eq_gf_coefficients(
+        (p_n2,), (p_he,), (a_n2,), (b_n2,), (a_he,), (b_he,)
+    )
+    limit, = _eq_gf_limits(gf, coefficients)
+    return limit
+
+
+def _eq_gf_coefficients(tissues_n2, tissues_he, n2_a, n2_b, he_a, he_b):
+    """
+    Calculate inert gas pressure and Buhlmann coefficients A and B of each
+    tissue compartment for mix of nitrogen and helium.
+
+    The function is a generator of tuples `(p, a, b)`.
+
+    :param tissues_n2: Nitrogen pressure of each tissue compartment.
+    :param tissues_he: Helium pressure of each tissue compartment.
+    :param n2_a: Nitrox Buhlmann coefficients A.
+    :param n2_b: Nitrox Buhlmann coefficients B.
+    :param he_a: Helium Buhlmann coefficients A.
+    :param he_b: Helium Buhlmann coefficients B.
+
+    .. seealso:: :py:func:`decotengu.model.eq_gf_limit`
+    """
+    tissues = zip(tissues_n2, tissues_he, n2_a, n2_b, he_a, he_b)
+    for p_n2, p_he, a_n2, b_n2, a_he, b_he in tissues:
+        p = p_n2 + p_he
+        a = (a_n2 * p_n2 + a_he * p_he) / p
+        b = (b_n2 * p_n2 + b_he * p_he) / p
+        yield p, a, b
+
+
+def _eq_gf_limits(gf, coefficients):
+    """
+    Calculate ascent ceiling limit of each tissue compartment.
+
+    The function is a generator of absolute pressure values.
+
+    :param gf: Gradient factor value.
+    :param coefficients: Inert gas pressure and Buhlmann coefficients of
+        each tissue compartment, see :py:func:`_eq_gf_coefficients`.
+
+    .. seealso:: :py:func:`decotengu.model.eq_gf_limit`
+    """
+    for p, a, b in coefficients:
+        yield (p - a * gf) / (gf / b + 1 - gf)
+
+
+def _eq_gf_pressure(gf, limit, a, b):
+    """
+    Calculate maximum inert gas pressure of a tissue compartment allowed
+    by ascent ceiling limit.
+
+    The equation is the inverse of the equation used by
+    :py:func:`_eq_gf_limits` function.
+
+    :param gf: Gradient factor value.
+    :param limit: Absolute pressure of ascent ceiling limit.
+    :param a: Buhlmann coefficient A.
+    :param b: Buhlmann coefficient B.
+    """
+    return limit * (gf / b + 1 - gf) + a * gf
 
 
 
@@ -427,8 +489,13 @@ class ZH_L16_GF(object):
         tissue compartment.
     :var he_k_const: Gas decay constants :math:`k` for helium for each
         tissues compartment.
+    :var _exp_cache: Exponential function, gas decay constants and values
+        of exponential function for nitrogen and helium gas decay
+        constants cached by time of exposure.
     """
     NUM_COMPARTMENTS = 16
+    EXP_CACHE_SIZE = 64 # max number of cached times of exposure, least
+                        # recently used are evicted
     N2_A = None
     N2_B = None
     HE_A = None
@@ -445,6 +512,7 @@ class ZH_L16_GF(object):
         super().__init__()
         self.n2_k_const = self._k_const(self.N2_HALF_LIFE)
         self.he_k_const = self._k_const(self.HE_HALF_LIFE)
+        self._exp_cache = None, None, None, OrderedDict(), OrderedDict()
         self.gf_low = 0.3
         self.gf_high = 0.85
 
@@ -462,7 +530,8 @@ class ZH_L16_GF(object):
         """
         p_n2 = self.START_P_N2 * (surface_pressure - self.water_vapour_pressure)
         p_he = self.START_P_HE
-        data = Data(tuple([(p_n2, p_he)] * self.NUM_COMPARTMENTS), self.gf_low)
+        n = self.NUM_COMPARTMENTS
+        data = Data((p_n2,) * n, (p_he,) * n, self.gf_low)
         return data
 
 
@@ -485,11 +554,73 @@ class ZH_L16_GF(object):
         """
         n2_loader, he_loader = self._tissue_loaders(abs_p, gas, rate)
 
-        tp = tuple(
-            (n2_loader(time, p_n2, i), he_loader(time, p_he, i))
-            for i, (p_n2, p_he) in enumerate(data.tissues)
+        return Data(
+            n2_loader(time, data.tissues_n2),
+            he_loader(time, data.tissues_he),
+            data.gf
         )
-        return Data(tp, data.gf)
+
+
+    def loader(self, abs_p, gas, rate):
+        """
+        Create function to calculate gas loading for all tissue
+        compartments at specified depth and with specified gas mix.
+
+        The created function accepts time of exposure [min] and
+        decompression model data and returns decompression model data.
+
+        Inspired inert gas pressure is calculated once for the created
+        function, therefore use it instead of
+        :py:meth:`decotengu.model.ZH_L16_GF.load` method when gas loading
+        is calculated many times at the same depth, i.e. when searching
+        for length of decompression stop.
+
+        :param abs_p: Absolute pressure [bar] (current depth).
+        :param gas: Gas mix configuration.
+        :param rate: Pressure rate change [bar/min].
+        """
+        n2_loader, he_loader = self._tissue_loaders(abs_p, gas, rate)
+
+        def f(time, data):
+            return Data(
+                n2_loader(time, data.tissues_n2),
+                he_loader(time, data.tissues_he),
+                data.gf
+            )
+        return f
+
+
+    def ceiling_checker(self, abs_p, gas, rate, limit, gf):
+        """
+        Create function to check if ascent ceiling limit is not deeper
+        than specified limit after gas loading at specified depth and with
+        specified gas mix.
+
+        The created function accepts time of exposure [min] and
+        decompression model data and returns true if the ascent ceiling
+        limit is not deeper than the limit.
+
+        The tissues gas loading is calculated with function created by
+        :py:meth:`decotengu.model.ZH_L16_GF.loader` method, then the
+        ascent ceiling limit is checked with
+        :py:meth:`decotengu.model.ZH_L16_GF.within_ceiling_limit` method.
+
+        FIXME: the method signature is gradient factor specific, the
+            signature has to be made decompression model independent
+
+        :param abs_p: Absolute pressure [bar] (current depth).
+        :param gas: Gas mix configuration.
+        :param rate: Pressure rate change [bar/min].
+        :param limit: Absolute pressure of ascent ceiling limit [bar].
+        :param gf: Gradient factor value.
+        """
+        assert gf > 0 and gf <= 1.5
+        load = self.loader(abs_p, gas, rate)
+        within_ceiling_limit = self.within_ceiling_limit
+
+        def f(time, data):
+            return within_ceiling_limit(limit, load(time, data), gf)
+        return f
 
 
     def ceiling_limit(self, data, gf=None):
@@ -512,7 +643,91 @@ class ZH_L16_GF(object):
             - :py:meth:`decotengu.model.ZH_L16_GF.gf_limit`
             - :py:meth:`decotengu.model.ZH_L16_GF._tissue_loader`
         """
-        return max(self.gf_limit(gf, data))
+        if gf is None:
+            gf = self.gf_low
+        assert gf > 0 and gf <= 1.5
+
+        # no tuple of limits is created for each tissue compartment
+        return max(_eq_gf_limits(gf, self._gf_coefficients(data)))
+
+
+    def within_ceiling_limit(self, abs_p, data, gf=None):
+        """
+        Check if absolute pressure is at or deeper than pressure of ascent
+        ceiling limit.
+
+        The check stops at first tissue compartment, which ascent ceiling
+        limit is deeper than the absolute pressure, therefore it is
+        cheaper than comparison with ascent ceiling limit calculated with
+        :py:meth:`decotengu.model.ZH_L16_GF.ceiling_limit` method.
+
+        FIXME: the method signature is gradient factor specific, the
+            signature has to be made decompression model independent
+
+        :param abs_p: Absolute pressure [bar].
+        :param data: Decompression model data.
+        :param gf: Gradient factor value, `gf_low` by default.
+
+        .. seealso:: :py:func:`decotengu.model.eq_gf_limit`
+        """
+        if gf is None:
+            gf = self.gf_low
+        assert gf > 0 and gf <= 1.5
+
+        limits = _eq_gf_limits(gf, self._gf_coefficients(data))
+        return not any(v > abs_p for v in limits)
+
+
+    def ceiling_time(self, abs_p, gas, data, limit, gf):
+        """
+        Estimate time of exposure at constant depth, after which pressure
+        of ascent ceiling limit is not deeper than specified limit.
+
+        The estimation is calculated by inverting Schreiner equation for
+        each tissue compartment, therefore it is available for nitrox gas
+        mixes only. Null is returned for gas mixes containing helium or
+        when the limit cannot be reached at the depth.
+
+        :param abs_p: Absolute pressure of current depth [bar].
+        :param gas: Gas mix configuration.
+        :param data: Decompression model data.
+        :param limit: Pressure of ascent ceiling limit [bar].
+        :param gf: Gradient factor value.
+
+        .. seealso:: :py:meth:`decotengu.model.ZH_L16_GF.ceiling_limit`
+        """
+        if gas.he > 0 or any(data.tissues_he):
+            return None
+
+        p_alv = gas.n2 / 100 * (abs_p - self.water_vapour_pressure)
+        tissues = zip(data.tissues_n2, self.n2_k_const, self.N2_A, self.N2_B)
+        time = 0
+        for p, k, a, b in tissues:
+            # maximum tissue pressure allowed by the limit
+            p_max = _eq_gf_pressure(gf, limit, a, b)
+            if p > p_max:
+                if p_max <= p_alv:
+                    return None
+                # the time is an estimation, so float is good enough even
+                # if decimal data type is used
+                t = math.log((p - p_alv) / (p_max - p_alv)) / float(k)
+                time = max(time, t)
+        return time
+
+
+    def _gf_coefficients(self, data):
+        """
+        Calculate inert gas pressure and Buhlmann coefficients A and B of
+        each tissue compartment.
+
+        :param data: Decompression model data.
+
+        .. seealso:: :py:func:`decotengu.model._eq_gf_coefficients`
+        """
+        return _eq_gf_coefficients(
+            data.tissues_n2, data.tissues_he,
+            self.N2_A, self.N2_B, self.HE_A, self.HE_B
+        )
 
 
     def _k_const(self, half_life):
@@ -546,30 +761,80 @@ class ZH_L16_GF(object):
         :param gas: Gas mix configuration.
         :param rate: Pressure rate change [bar/min] (:math:`P_{rate}`).
         """
+        n2_cache, he_cache = self._exp_caches()
         n2_loader = self._tissue_loader(
-            abs_p, gas.n2 / 100, rate, self.n2_k_const
+            abs_p, gas.n2 / 100, rate, self.n2_k_const, n2_cache
         )
         he_loader = self._tissue_loader(
-            abs_p, gas.he / 100, rate, self.he_k_const
+            abs_p, gas.he / 100, rate, self.he_k_const, he_cache
         )
         return n2_loader, he_loader
 
 
-    def _tissue_loader(self, abs_p, f_gas, rate, k_const):
+    def _exp_caches(self):
+        """
+        Get caches of exponential function values for nitrogen and helium
+        gas decay constants.
+
+        Dive profile calculation uses a small set of exposure times (i.e.
+        ascent by 3m, 1 minute deco stop), so values of exponential
+        function are cached by time. The caches are reset when the
+        exponential function is overridden, i.e. by tabular calculator,
+        or when gas decay constants change.
+
+        .. seealso:: :py:meth:`decotengu.model.ZH_L16_GF._exp_values`
         """
-        Create function to load tissue compartment with inert gas.
+        exp, n2_k_const, he_k_const, n2_cache, he_cache = self._exp_cache
+        if exp != self._exp or n2_k_const is not self.n2_k_const \
+                or he_k_const is not self.he_k_const:
+            n2_cache, he_cache = OrderedDict(), OrderedDict()
+            self._exp_cache = self._exp, self.n2_k_const, self.he_k_const, \
+                n2_cache, he_cache
+        return n2_cache, he_cache
+
+
+    def _exp_values(self, time, k_const, cache):
+        """
+        Calculate values of exponential function for time of exposure and
+        gas decay constants of all tissue compartments.
+
+        The values are looked up in the cache first. Calculated values
+        are stored in the cache. When the cache is full, then the least
+        recently used values are removed from the cache.
 
-        The created function uses Schreiner equation and has the following
+        :param time: Time of exposure [min].
+        :param k_const: Collection of gas decay constants for each tissue
+            compartment.
+        :param cache: Values of exponential function cached by time of
+            exposure.
+        """
+        exp_kt = cache.get(time)
+        if exp_kt is None:
+            exp = self._exp
+            exp_kt = tuple([exp(time, k) for k in k_const])
+            cache[time] = exp_kt
+            if len(cache) > self.EXP_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(time)
+        return exp_kt
+
+
+    def _tissue_loader(self, abs_p, f_gas, rate, k_const, cache=None):
+        """
+        Create function to load tissue compartments with inert gas.
+
+        The created function uses Schreiner equation to calculate inert gas
+        pressure of all tissue compartments at once and has the following
         parameters
 
         time
             Time of exposure [min] at depth (:math:`T_{time}`).
-        p_i
-            Initial (current) pressure of inert gas in tissue compartment
-            [bar] (:math:`P_{i}`).
-        tissue_no
-            Number of tissue compartment in the decompression model
-            (starting with zero).
+        tissues
+            Initial (current) pressure of inert gas in each tissue
+            compartment [bar] (:math:`P_{i}`).
+
+        The function returns tuple of inert gas pressure values.
 
         See :ref:`eq-schreiner` section for details.
 
@@ -578,15 +843,28 @@ class ZH_L16_GF(object):
         :param rate: Pressure rate change [bar/min] (:math:`P_{rate}`).
         :param k_const: Collection of gas decay constants for each tissue
             compartment (:math:`k`).
+        :param cache: Values of exponential function for the gas decay
+            constants cached by time of exposure.
         """
         p_alv = f_gas * (abs_p - self.water_vapour_pressure)
         r = f_gas * rate
-        def f(time, p_i, tissue_no):
+        exp_values = self._exp_values
+        if cache is None:
+            cache = OrderedDict()
+        def f(time, tissues):
             assert time > 0
-            k = k_const[tissue_no]
-            return p_alv + r * (time - 1 / k) - (p_alv - p_i - r / k) \
-                * self._exp(time, k)
-            #return p_alv + r * (t - 1 / k) - (p_alv - p_i - r / k) * math.exp(-k * t)
+            exp_kt = exp_values(time, k_const, cache)
+            if r:
+                return tuple([
+                    p_alv + r * (time - 1 / k) - (p_alv - p_i - r / k) * e
+                    for p_i, k, e in zip(tissues, k_const, exp_kt)
+                ])
+            # at constant depth the rate terms of Schreiner equation are
+            # zero, so the equation reduces to Haldane equation and no
+            # division by gas decay constant is needed
+            return tuple([
+                p_alv - (p_alv - p_i) * e for p_i, e in zip(tissues, exp_kt)
+            ])
         return f
 
 
@@ -605,11 +883,32 @@ class ZH_L16_GF(object):
             gf = self.gf_low
         assert gf > 0 and gf <= 1.5
 
-        data = zip(data.tissues, self.N2_A, self.N2_B, self.HE_A, self.HE_B)
-        return tuple(
-            eq_gf_limit(gf, p_n2, p_he, n2_a, n2_b, he_a, he_b)
-            for (p_n2, p_he), n2_a, n2_b, he_a, he_b in data
-        )
+        return tuple(_eq_gf_limits(gf, self._gf_coefficients(data)))
+
+
+    def gf_limits(self, gfs, data):
+        """
+        Calculate pressure of ascent ceiling for each tissue compartment
+        and for each gradient factor value.
+
+        The method returns a tuple of values for each gradient factor
+        value, see :py:meth:`decotengu.model.ZH_L16_GF.gf_limit` method.
+
+        The Buhlmann coefficients of a tissue compartment are calculated
+        once for all gradient factor values, therefore use this method
+        instead of calling `gf_limit` method for each gradient factor
+        value.
+
+        :param gfs: Collection of gradient factor values.
+        :param data: Decompression model data.
+
+        .. seealso:: :py:func:`decotengu.model.eq_gf_limit`
+        """
+        # FIXME: make it model independent
+        assert all(gf > 0 and gf <= 1.5 for gf in gfs)
+
+        coefficients = tuple(self._gf_coefficients(data))
+        return tuple(tuple(_eq_gf_limits(gf, coefficients)) for gf in gfs)
 
 
 
@@ -682,14 +981,19 @@ class DecoModelValidator(object):
     Create coroutine object, then call it to start the coroutine.
 
     :var engine: DecoTengu decompression engine.
+    :var ascent_only: If true, then skip ceiling limit validation of dive
+        start, descent and bottom time steps.
     """
-    def __init__(self, engine):
+    def __init__(self, engine, ascent_only=False):
         """
         Create coroutine object.
 
         :param engine: DecoTengu decompression engine.
+        :param ascent_only: If true, then skip ceiling limit validation of
+            dive start, descent and bottom time steps.
         """
         self.engine = engine
+        self.ascent_only = ascent_only
         self._first_stop_checked = False
 
 
@@ -699,12 +1003,21 @@ class DecoModelValidator(object):
         Start the coroutine.
         """
         logger.info('started deco model validator')
-        prev = None
+        # ascent ceiling limit is expected to be shallower than dive
+        # start, descent and bottom time steps, so optionally trust the
+        # engine and skip validation of ceiling limit for them
+        # FIXME: Phase circular import, so using phase names below
+        no_ceiling = {'start', 'descent', 'const'} if self.ascent_only \
+            else set()
+        prev = prev_limit = None
         while True:
             step = yield
-            self._ceiling_limit(step)
-            self._first_stop_at_ceiling(prev, step)
+            limit = None
+            if step.phase not in no_ceiling:
+                limit = self._ceiling_limit(step)
+            self._first_stop_at_ceiling(prev, step, prev_limit)
             prev = step
+            prev_limit = limit
 
 
     def _ceiling_limit(self, step):
@@ -712,6 +1025,8 @@ class DecoModelValidator(object):
         Verify that a dive step is deeper than a pressure ceiling limit.
 
         :param step: Dive step to verify.
+
+        Pressure of ascent ceiling limit of the dive step is returned.
         """
         limit = self.engine.model.ceiling_limit(step.data, step.data.gf)
         if step.abs_p < limit: # ok when step.abs_p >= limit
@@ -719,19 +1034,27 @@ class DecoModelValidator(object):
                 'Pressure ceiling validation error at {} (limit={})'
                 .format(step, limit)
             )
+        return limit
 
 
-    def _first_stop_at_ceiling(self, prev, step):
+    def _first_stop_at_ceiling(self, prev, step, limit=None):
         """
         Verify that first decompression stop is at pressure ceiling limit.
 
+        The pressure of ascent ceiling limit of previous dive step, already
+        calculated by ceiling limit validator, is reused if it was
+        calculated with `gf_low` gradient factor value.
+
         :param prev: Previous dive step.
         :param step: Dive step to verify.
+        :param limit: Pressure of ascent ceiling limit of previous dive step.
         """
         # FIXME: Phase circular import, so using 'deco_stop' below
         if not self._first_stop_checked and step.phase == 'deco_stop':
             stop = prev
-            limit = self.engine.model.ceiling_limit(stop.data)
+            model = self.engine.model
+            if limit is None or stop.data.gf != model.gf_low:
+                limit = model.ceiling_limit(stop.data)
             # if further ascent was possible, then first deco stop is at
             # wrong depth, i.e. stop at 21m and limit at 17.9 results in
             # error
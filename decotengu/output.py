@@ -28,7 +28,9 @@ The implemented coroutines
 
 import csv
 import logging
+import operator
 from collections import namedtuple
+from itertools import count, repeat
 
 from .flow import coroutine
 
@@ -68,19 +70,21 @@ class DiveStepInfoGenerator(object):
         """
         model = self.engine.model
         target = self.target
+        to_depth = self.engine._to_depth
         while True:
             step = yield
             gf_low = step.data.gf
             data = step.data
             phase = step.phase
-            to_depth = self.engine._to_depth
 
-            tl = model.gf_limit(gf_low, data)
-            tm = model.gf_limit(1, data)
+            tl, tm = model.gf_limits((gf_low, 1), data)
 
+            # create tissue information records with map function calls
+            # instead of generator expression, so no generator frame is
+            # resumed for each tissue compartment
+            tp = map(operator.add, data.tissues_n2, data.tissues_he)
             tissues = tuple(
-                InfoTissue(k, p_n2 + p_he, l, data.gf, gf)
-                for k, ((p_n2, p_he), l, gf) in enumerate(zip(data.tissues, tm, tl), 1)
+                map(InfoTissue, count(1), tp, tm, repeat(data.gf), tl)
             )
             sample = InfoSample(
                 to_depth(step.abs_p), step.time, step.abs_p,
@@ -109,16 +113,16 @@ def csv_writer(f, target=None):
     while True:
         sample = yield
 
-        r1 = [
+        gas = sample.gas
+        r1 = (
             sample.depth, sample.time, sample.pressure,
-            sample.gas.o2, sample.gas.n2, sample.gas.he
-        ]
-        for tissue in sample.tissues:
-            r2 = [
-                tissue.no, tissue.pressure, tissue.limit, tissue.gf,
-                tissue.gf_limit, sample.phase
-            ]
-            fcsv.writerow(r1 + r2)
+            gas.o2, gas.n2, gas.he
+        )
+        phase = (sample.phase,)
+        # tissue information record fields are in the order of the
+        # header, so write them without attribute lookup and write all
+        # rows of the sample at once
+        fcsv.writerows(r1 + tissue + phase for tissue in sample.tissues)
 
         if target:
             target.send(sample)
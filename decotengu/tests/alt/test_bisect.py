@@ -51,19 +51,47 @@ class BisectFindFirstStopTestCase(unittest.TestCase):
         Call Engine._find_first_stop method and check if appropriate
         ascent time is calculated.
         """
+        engine = self.engine
+        engine.model.ceiling_limit = mock.MagicMock(return_value=1.2)
+        engine._can_ascend = mock.MagicMock(return_value=False)
+
         start = _step(Phase.ASCENT, 4.1, 20)
         f_bf.return_value = 6 # 31m -> 30m - k * 3m == 12m,
                               # so ascent for 19m or 114s
-        step = self.engine._find_first_stop(start, 1.0, AIR)
+        step = engine._find_first_stop(start, 1.0, AIR)
         self.assertAlmostEqual(21.9, step.time)
         self.assertAlmostEqual(2.2, step.abs_p)
 
+        # guess at 3m is checked, then bisect is performed for 1 <= k <= 8
+        self.assertEqual(1, engine._can_ascend.call_count)
+        self.assertEqual(8, f_bf.call_args_list[0][0][0])
+
+
+    @mock.patch('decotengu.alt.bisect.bisect_find')
+    def test_first_stop_finder_guess(self, f_bf):
+        """
+        Test bisect first deco stop finder when guess is first deco stop
+        """
+        engine = self.engine
+        engine.model.ceiling_limit = mock.MagicMock(return_value=2.0)
+        engine._can_ascend = mock.MagicMock(side_effect=[True, False])
+
+        start = _step(Phase.ASCENT, 4.1, 20)
+        step = engine._find_first_stop(start, 1.0, AIR)
+        self.assertAlmostEqual(21.9, step.time)
+        self.assertAlmostEqual(2.2, step.abs_p)
+
+        self.assertEqual(2, engine._can_ascend.call_count)
+        self.assertFalse(f_bf.called)
+
 
     @mock.patch('decotengu.alt.bisect.bisect_find')
     def test_first_stop_finder_at_depth(self, f_bf):
         """
         Test bisect first deco stop finder when starting depth is deco stop
         """
+        self.engine.model.ceiling_limit = mock.MagicMock(return_value=2.2)
+
         start = _step(Phase.ASCENT, 2.2, 20)
         f_bf.return_value = 0 # the 12m is depth of deco stop
         step = self.engine._find_first_stop(start, 1.0, AIR)
@@ -78,6 +106,8 @@ class BisectFindFirstStopTestCase(unittest.TestCase):
         Above means that `n` passed to `bisect_find` is `0`. Should not be
         possible, but let's be defensive here.
         """
+        self.engine.model.ceiling_limit = mock.MagicMock(return_value=2.3)
+
         start = _step(Phase.ASCENT, 2.3, 1200)
 
         f_bf.return_value = 0
@@ -90,14 +120,22 @@ class BisectFindFirstStopTestCase(unittest.TestCase):
     def test_first_stop_finder_steps(self, f_bf):
         """
         Test bisect if first deco stop finder calculates proper amount of steps (depth=0m)
+
+        The guess at 12m and its neighbour at 9m allow ascent, so bisect is
+        performed for depths above 9m.
         """
+        engine = self.engine
+        engine.model.ceiling_limit = mock.MagicMock(return_value=2.0)
+        engine._can_ascend = mock.MagicMock(return_value=True)
+
         start = _step(Phase.ASCENT, 4.1, 1200)
 
-        f_bf.return_value = 6
-        self.engine._find_first_stop(start, 1.0, AIR)
+        f_bf.return_value = 2
+        step = engine._find_first_stop(start, 1.0, AIR)
 
         assert f_bf.called # test precondition
-        self.assertEqual(10, f_bf.call_args_list[0][0][0])
+        self.assertEqual(3, f_bf.call_args_list[0][0][0])
+        self.assertAlmostEqual(1.3, step.abs_p)
 
 
     @mock.patch('decotengu.alt.bisect.bisect_find')
@@ -105,13 +143,17 @@ class BisectFindFirstStopTestCase(unittest.TestCase):
         """
         Test bisect first deco stop finder when no deco required
         """
+        engine = self.engine
+        engine.model.ceiling_limit = mock.MagicMock(return_value=1.0)
+        engine._can_ascend = mock.MagicMock(return_value=True)
+
         start = _step(Phase.ASCENT, 4.1, 20)
 
-        f_bf.return_value = 10 # 31m -> 30m - k * 3m == 0m,
-                               # so 31m ascent or 186s
-        step = self.engine._find_first_stop(start, 1.0, AIR)
+        # 31m -> 30m - k * 3m == 0m, so 31m ascent or 186s
+        step = engine._find_first_stop(start, 1.0, AIR)
         self.assertAlmostEqual(23.1, step.time)
         self.assertAlmostEqual(1.0, step.abs_p)
+        self.assertFalse(f_bf.called)
 
 
 # vim: sw=4:et:ai
@@ -26,6 +26,8 @@ from decotengu.error import ConfigError, EngineError
 
 from .tools import _step, _engine, _data, AIR, EAN50
 
+import copy
+import pickle
 import unittest
 from unittest import mock
 
@@ -80,6 +82,40 @@ class EngineTestCase(unittest.TestCase):
         self.assertEqual(v, 0.3) # 3m at 10m/min -> 0.3min (18s)
 
 
+    def test_pressure_to_time_ascent(self):
+        """
+        Test deco engine pressure to time conversion using ascent rate
+        """
+        self.engine.ascent_rate = 10
+        v = self.engine._pressure_to_time_ascent(.3)
+        self.assertAlmostEqual(v, 0.3) # 3m at 10m/min -> 0.3min (18s)
+
+        self.engine.ascent_rate = 5
+        v = self.engine._pressure_to_time_ascent(.3)
+        self.assertAlmostEqual(v, 0.6) # 3m at 5m/min -> 0.6min
+
+
+    def test_ascent_time_3m(self):
+        """
+        Test deco engine time of ascent by 3m update on ascent rate change
+        """
+        self.engine.ascent_rate = 10
+        self.assertAlmostEqual(0.3, self.engine._ts_3m)
+
+        self.engine.ascent_rate = 5
+        self.assertAlmostEqual(0.6, self.engine._ts_3m)
+
+
+    def test_ascent_time_3m_pressure(self):
+        """
+        Test deco engine time of ascent by 3m update on pressure of 3m change
+        """
+        self.engine.ascent_rate = 10
+        self.engine._p3m = 0.6
+        self.engine._update_rates()
+        self.assertAlmostEqual(0.6, self.engine._ts_3m)
+
+
     def test_ceil_pressure_3m(self):
         """
         Test ceiling of absolute pressure at value divisble by 3
@@ -118,9 +154,14 @@ class EngineTestCase(unittest.TestCase):
         Test ceiling limit invariant
         """
         step = _step(Phase.CONST, 3.0, 120)
-        self.engine.model.ceiling_limit = mock.MagicMock(return_value=3.0)
+        self.engine.model.within_ceiling_limit = mock.MagicMock(
+            return_value=True
+        )
         v = self.engine._inv_limit(step.abs_p, step.data)
         self.assertTrue(v)
+        self.engine.model.within_ceiling_limit.assert_called_once_with(
+            3.0, step.data
+        )
 
 
     def test_ascent_invariant_edge(self):
@@ -128,7 +169,9 @@ class EngineTestCase(unittest.TestCase):
         Test ascent invariant (at limit)
         """
         step = _step(Phase.CONST, 3.1, 120)
-        self.engine.model.ceiling_limit = mock.MagicMock(return_value=3.101)
+        self.engine.model.within_ceiling_limit = mock.MagicMock(
+            return_value=False
+        )
         v = self.engine._inv_limit(step.abs_p, step.data)
         self.assertFalse(v)
 
@@ -256,17 +299,26 @@ class EngineTestCase(unittest.TestCase):
         Test function checking ascent possibility
         """
         data = [1.1, 2.1]
-        self.engine.model.ceiling_limit = mock.MagicMock(return_value=3.0)
+        self.engine.model.within_ceiling_limit = mock.MagicMock(
+            return_value=True
+        )
         v = self.engine._can_ascend(3.2, 0.2, data)
         self.assertTrue(v)
 
+        # check ceiling limit at pressure of depth after ascent
+        args = self.engine.model.within_ceiling_limit.call_args[0]
+        self.assertAlmostEqual(3.0, args[0])
+        self.assertEqual(data, args[1])
+
 
     def test_ascent_check_edge(self):
         """
         Test function checking ascent possibility (at limit)
         """
         data = [1.1, 2.1]
-        self.engine.model.ceiling_limit = mock.MagicMock(return_value=3.101)
+        self.engine.model.within_ceiling_limit = mock.MagicMock(
+            return_value=False
+        )
         v = self.engine._can_ascend(3.4, 18, data)
         self.assertFalse(v)
 
@@ -320,6 +372,15 @@ class EngineTestCase(unittest.TestCase):
         self.assertEquals(5, step.abs_p, step)
 
 
+    def test_step_eq_other_type(self):
+        """
+        Test dive step comparison with object of other type
+        """
+        step = _step(Phase.CONST, 3.0, 20)
+        self.assertEquals(step, mock.ANY)
+        self.assertNotEquals(step, None)
+
+
 
 class FirstStopFinderTestCase(unittest.TestCase):
     """
@@ -945,29 +1006,96 @@ class EngineDiveAscentTestCase(unittest.TestCase):
         self.assertEquals([0.1] * 3 + [0.2], diff)
 
 
-    @mock.patch('decotengu.engine.recurse_while')
     @mock.patch('decotengu.engine.bisect_find')
-    def test_deco_stop(self, f_bf, f_r):
+    def test_deco_stop(self, f_bf):
         """
         Test deco stop calculation
         """
         self.engine.model.gf_low = 0.30
         self.engine.model.gf_high = 0.90
+        self.engine.model.ceiling_time = mock.MagicMock(return_value=None)
 
         data = _data(0.3, 2.5, 2.5, 2.5)
         step = _step(Phase.ASCENT, 2.5, 2, data=data)
 
-        self.engine._can_ascend = mock.MagicMock(return_value=False)
-        f_r.return_value = (0, data)
-        f_bf.return_value = 2 # expect 3min deco stop
+        # ascent not possible after 1, 2 and 4 minutes, but possible after
+        # 8 minutes
+        self.engine._can_ascend = mock.MagicMock(
+            side_effect=[False, False, False, True]
+        )
+        f_bf.return_value = 2 # expect 7min deco stop
 
         step = self.engine._deco_stop(step, 0.3, AIR, 0.42)
-        self.assertEquals(5, step.time)
+        self.assertEquals(9, step.time)
+        self.assertEquals(4, self.engine._can_ascend.call_count)
+
+        # binary search within (4, 8) range
+        n = f_bf.call_args[0][0]
+        self.assertEquals(3, n)
 
 
-    @mock.patch('decotengu.engine.recurse_while')
     @mock.patch('decotengu.engine.bisect_find')
-    def test_deco_stop_1min(self, f_bf, f_r):
+    def test_deco_stop_estimation(self, f_bf):
+        """
+        Test deco stop calculation using decompression model estimation
+        """
+        engine = self.engine
+        engine.ascent_rate = 10
+        data = engine.model.init(1.0)
+        data = engine.model.load(5.0, 40, AIR, 0, data)._replace(gf=0.3)
+        step = _step(Phase.ASCENT, 3.1, 40, data=data)
+
+        step = engine._deco_stop(step, 0.3, AIR, 0.3)
+
+        # ascent is possible at the end of the stop, but not a minute
+        # earlier
+        can_ascend = lambda t: engine._can_ascend(
+            3.1, 0.3, engine._tissue_pressure_const(3.1, t, AIR, data), 0.3
+        )
+        t = step.time - 40
+        self.assertTrue(t > 2)
+        self.assertTrue(can_ascend(t))
+        self.assertFalse(can_ascend(t - 1))
+        self.assertFalse(f_bf.called)
+
+
+    @mock.patch('decotengu.engine.bisect_find')
+    def test_deco_stop_estimation_failed(self, f_bf):
+        """
+        Test deco stop calculation reusing probes of failed estimation
+        """
+        engine = self.engine
+        engine.model.ceiling_time = mock.MagicMock(return_value=4.2)
+        engine._tissue_pressure_const = mock.MagicMock(
+            side_effect=lambda abs_p, time, gas, data: data
+        )
+
+        data = _data(0.3, 2.5, 2.5, 2.5)
+        step = _step(Phase.ASCENT, 2.5, 2, data=data)
+
+        # ascent not possible after 5, 6 and 7 minutes, but possible after
+        # 9 minutes
+        engine._can_ascend = mock.MagicMock(
+            side_effect=[False, False, False, True]
+        )
+        f_bf.return_value = 1 # expect 9min deco stop
+
+        step = engine._deco_stop(step, 0.3, AIR, 0.42)
+        self.assertEquals(11, step.time)
+        self.assertEquals(4, engine._can_ascend.call_count)
+
+        # search continues after the estimation probes, 1 minute
+        # deco stop is not checked; the last call calculates the deco stop
+        calls = engine._tissue_pressure_const.call_args_list
+        self.assertEquals([5, 6, 1, 2, 9], [c[0][1] for c in calls])
+
+        # binary search within (7, 9) range
+        n = f_bf.call_args[0][0]
+        self.assertEquals(1, n)
+
+
+    @mock.patch('decotengu.engine.bisect_find')
+    def test_deco_stop_1min(self, f_bf):
         """
         Test 1min deco stop calculation
         """
@@ -978,7 +1106,6 @@ class EngineDiveAscentTestCase(unittest.TestCase):
         step = _step(Phase.ASCENT, 2.5, 2, data=data)
 
         self.engine._can_ascend = mock.MagicMock(return_value=True)
-        f_r.return_value = None
         f_bf.return_value = None
 
         step = self.engine._deco_stop(step, 0.3, AIR, 0.42)
@@ -1011,6 +1138,46 @@ class GasMixTestCase(unittest.TestCase):
         self.assertEquals(33, mix.depth)
 
 
+    def test_gas_mix_read_only(self):
+        """
+        Test gas mix attributes being read-only
+        """
+        mix = GasMix(0, 21, 79, 0)
+        with self.assertRaises(AttributeError):
+            mix.o2 = 32
+        with self.assertRaises(AttributeError):
+            del mix.depth
+        self.assertEquals(21, mix.o2)
+        self.assertEquals(0, mix.depth)
+
+
+    def test_gas_mix_copy(self):
+        """
+        Test gas mix copy and pickling
+        """
+        mix = GasMix(6, 50, 50, 0)
+        self.assertEquals(mix, copy.copy(mix))
+        self.assertEquals(mix, pickle.loads(pickle.dumps(mix)))
+
+
+    def test_gas_mix_replace(self):
+        """
+        Test gas mix copy with replaced attributes
+        """
+        mix = GasMix(0, 21, 79, 0)._replace(depth=6)
+        self.assertEquals(GasMix(6, 21, 79, 0), mix)
+        self.assertEquals(hash(GasMix(6, 21, 79, 0)), hash(mix))
+
+
+    def test_gas_mix_eq_other_type(self):
+        """
+        Test gas mix comparison with object of other type
+        """
+        mix = GasMix(0, 21, 79, 0)
+        self.assertEquals(mix, mock.ANY)
+        self.assertNotEquals(mix, (0, 21, 79, 0))
+
+
     def test_adding_gas_trimix(self):
         """
         Test deco engine adding new trimix gas
@@ -1043,6 +1210,24 @@ class GasMixTestCase(unittest.TestCase):
         self.assertEquals(55, mix4.he)
 
 
+    def test_adding_gas_sorted(self):
+        """
+        Test deco engine keeping gas mix lists sorted by switch depth
+        """
+        self.engine.add_gas(0, 21)
+        self.engine.add_gas(6, 100)
+        self.engine.add_gas(22, 50)
+        self.engine.add_gas(11, 80)
+        self.engine.add_gas(10, 36, travel=True)
+        self.engine.add_gas(0, 32, travel=True)
+
+        depths = [m.depth for m in self.engine._gas_list]
+        self.assertEquals([0, 22, 11, 6], depths)
+
+        depths = [m.depth for m in self.engine._travel_gas_list]
+        self.assertEquals([0, 10], depths)
+
+
     def test_gas_list_empty(self):
         """
         Test gas list validation rule about empty gas mix list
@@ -1071,6 +1256,29 @@ class GasMixTestCase(unittest.TestCase):
         self.assertRaises(ConfigError, self.engine._validate_gas_list, 56)
 
 
+    def test_gas_list_validation_deco_depth_unordered(self):
+        """
+        Test gas list validation rule about deco gas mixes depths (gas mixes added in random order)
+        """
+        self.engine.add_gas(0, 21)
+        self.engine.add_gas(12, 79)
+        self.engine.add_gas(21, 50)
+        self.engine.add_gas(12, 80)
+        self.assertRaises(ConfigError, self.engine._validate_gas_list, 56)
+
+
+    def test_gas_list_validation(self):
+        """
+        Test gas list validation of valid gas mix list
+        """
+        self.engine.add_gas(0, 32, travel=True)
+        self.engine.add_gas(30, 18, 45)
+        self.engine.add_gas(6, 100)
+        self.engine.add_gas(21, 50)
+        self.engine.add_gas(20, 28, travel=True)
+        self.engine._validate_gas_list(56)
+
+
     def test_gas_list_validation_deco_depth_non_zero(self):
         """
         Test gas list validation rule about deco gas mixes depths > 0
@@ -1141,6 +1349,32 @@ class DecoTableTestCase(unittest.TestCase):
         self.assertEquals(4, dt[0].time)
         self.assertEquals(12, dt[1].depth)
         self.assertEquals(1, dt[1].time)
+        self.assertTrue(isinstance(dt[1].time, int))
+        self.assertTrue(isinstance(dt.total, int))
+
+
+    def test_adding_stop_time(self):
+        """
+        Test adding deco stop lasting fraction of minute to deco table
+        """
+        dt = DecoTable()
+        dt.append(15, 4)
+        dt.append(12, 1.3 + 10e-12)
+
+        self.assertEquals(1.3, dt[1].time)
+        self.assertEquals(5.3, dt.total)
+
+
+    def test_adding_stops(self):
+        """
+        Test adding collection of deco stops to deco table
+        """
+        dt = DecoTable()
+        dt.extend([(15, 4), (12, 1 - 10e-12)])
+
+        self.assertEquals(2, len(dt))
+        self.assertEquals(DecoStop(15, 4), dt[0])
+        self.assertEquals(DecoStop(12, 1), dt[1])
 
 
     def test_total(self):
@@ -1164,4 +1398,59 @@ class DecoTableTestCase(unittest.TestCase):
         self.assertEquals(0, dt.total)
 
 
+    def test_total_removed(self):
+        """
+        Test deco table total time summary after removing deco stops
+        """
+        dt = DecoTable()
+        dt.extend([(15, 3), (12, 1)])
+        dt.append(9, 2)
+        self.assertEquals(6, dt.total)
+
+        del dt[0]
+        self.assertEquals(3, dt.total)
+
+        del dt[:]
+        self.assertEquals(0, dt.total)
+
+        dt.append(9, 2)
+        dt.clear()
+        self.assertEquals(0, dt.total)
+
+
+    def test_total_changed(self):
+        """
+        Test deco table total time summary after changing deco stops
+        """
+        dt = DecoTable()
+        dt.append(9, 3)
+        dt.append(6, 5)
+        dt.pop()
+        self.assertEquals(3, dt.total)
+
+        dt.insert(0, DecoStop(12, 2))
+        self.assertEquals(5, dt.total)
+
+        dt[0] = DecoStop(12, 4)
+        self.assertEquals(7, dt.total)
+
+        dt += [DecoStop(3, 6)]
+        self.assertEquals(13, dt.total)
+
+        dt.remove(DecoStop(9, 3))
+        self.assertEquals(10, dt.total)
+
+        dt *= 2
+        self.assertEquals(20, dt.total)
+
+
+    def test_create_from_stops(self):
+        """
+        Test creating deco table from collection of deco stops
+        """
+        dt = DecoTable([DecoStop(15, 3), DecoStop(12, 1)])
+        self.assertEquals(2, len(dt))
+        self.assertEquals(4, dt.total)
+
+
 # vim: sw=4:et:ai
@@ -21,7 +21,7 @@
 Test for DecoTengu data flow processing functions and coroutines.
 """
 
-from decotengu.flow import sender, coroutine
+from decotengu.flow import sender, split, coroutine
 
 import unittest
 
@@ -49,4 +49,28 @@ class SenderTestCase(unittest.TestCase):
         self.assertEquals([0, 1, 2], data)
 
 
+
+class SplitTestCase(unittest.TestCase):
+    """
+    Split coroutine tests.
+    """
+    def test_split(self):
+        """
+        Test sending data to multiple coroutines
+        """
+        d1 = []
+        d2 = []
+        @coroutine
+        def printer(data):
+            while True:
+                v = yield
+                data.append(v)
+
+        t = split(printer(d1), printer(d2))
+        t.send(1)
+        t.send(2)
+        self.assertEquals([1, 2], d1)
+        self.assertEquals([1, 2], d2)
+
+
 # vim: sw=4:et:ai
@@ -17,7 +17,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
-from decotengu.ft import bisect_find, recurse_while
+from decotengu.ft import bisect_find, recurse_while, pairwise
 
 import unittest
 
@@ -104,4 +104,24 @@ class BisectFindTestCase(unittest.TestCase):
         self.assertEquals(10, k)
 
 
+
+class PairwiseTestCase(unittest.TestCase):
+    """
+    Pairwise iteration tests.
+    """
+    def test_pairwise(self):
+        """
+        Test pairwise iteration
+        """
+        self.assertEquals([(1, 2), (2, 3)], list(pairwise([1, 2, 3])))
+
+
+    def test_pairwise_short(self):
+        """
+        Test pairwise iteration of sequence shorter than two items
+        """
+        self.assertEquals([], list(pairwise([1])))
+        self.assertEquals([], list(pairwise([])))
+
+
 # vim: sw=4:et:ai
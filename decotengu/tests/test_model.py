@@ -21,9 +21,10 @@
 DecoTengu calculator tests.
 """
 
-from decotengu.engine import Engine, Phase
+from decotengu.engine import Engine, Phase, GasMix
 from decotengu.error import EngineError
 from decotengu.model import eq_gf_limit, ZH_L16B_GF, Data, DecoModelValidator
+from decotengu.model import _eq_gf_pressure
 
 from .tools import _engine, _step, AIR
 
@@ -46,7 +47,7 @@ class TissueLoadingTestCase(unittest.TestCase):
         """
         # ascent, so rate == -1 bar/min
         loader = self.model._tissue_loader(4, 0.79, -1, self.k_const)
-        v = loader(1, 3, 0)
+        v = loader(1, (3,) * 16)[0]
         self.assertAlmostEqual(2.96198, v, 4)
 
 
@@ -56,17 +57,26 @@ class TissueLoadingTestCase(unittest.TestCase):
         """
         # rate == 1 bar/min
         loader = self.model._tissue_loader(4, 0.79, 1, self.k_const)
-        v = loader(1, 3, 0)
+        v = loader(1, (3,) * 16)[0]
         self.assertAlmostEqual(3.06661, v, 4)
 
 
+    def test_air_const(self):
+        """
+        Test tissue compartment loading - constant depth on air
+        """
+        loader = self.model._tissue_loader(4, 0.79, 0, self.k_const)
+        v = loader(1, (3,) * 16)[0]
+        self.assertAlmostEqual(3.01430, v, 4)
+
+
     def test_ean_ascent(self):
         """
         Test tissue compartment loading - ascent by 10m on EAN32
         """
         # ascent, so rate == -1 bar/min
         loader = self.model._tissue_loader(4, 0.68, -1, self.k_const)
-        v = loader(1, 3, 0)
+        v = loader(1, (3,) * 16)[0]
         self.assertAlmostEqual(2.9132, v, 4)
 
 
@@ -76,10 +86,98 @@ class TissueLoadingTestCase(unittest.TestCase):
         """
         # rate == 1 bar/min
         loader = self.model._tissue_loader(4, 0.68, 1, self.k_const)
-        v = loader(1, 3, 0)
+        v = loader(1, (3,) * 16)[0]
         self.assertAlmostEqual(3.00326, v, 4)
 
 
+    def test_exp_cache(self):
+        """
+        Test caching of exponential function values for time of exposure
+        """
+        m = self.model
+        data = m.init(1.0)
+        m._exp = mock.MagicMock(side_effect=m._exp)
+
+        v1 = m.load(4, 1, AIR, 0, data)
+        self.assertEqual(32, m._exp.call_count)
+
+        v2 = m.load(4, 1, AIR, 0, data)
+        self.assertEqual(v1, v2)
+        self.assertEqual(32, m._exp.call_count) # cached values used
+
+        m.load(4, 2, AIR, 0, data)
+        self.assertEqual(64, m._exp.call_count)
+
+
+    def test_exp_cache_ceiling_checker(self):
+        """
+        Test sharing exponential function values cache with ceiling checker
+        """
+        m = self.model
+        data = m.init(1.0)
+        m._exp = mock.MagicMock(side_effect=m._exp)
+
+        m.load(4, 1, AIR, 0, data)
+        self.assertEqual(32, m._exp.call_count)
+
+        check = m.ceiling_checker(4, AIR, 0, 1.0, 0.3)
+        check(1, data)
+        self.assertEqual(32, m._exp.call_count) # cached values used
+
+
+    def test_exp_cache_reset(self):
+        """
+        Test resetting exponential function values cache on override
+        """
+        m = self.model
+        data = m.init(1.0)
+        m.load(4, 1, AIR, 0, data)
+
+        m._exp = mock.MagicMock(return_value=0.5)
+        v = m.load(4, 1, AIR, 0, data)
+        self.assertEqual(32, m._exp.call_count)
+
+        expected = m._tissue_loader(4, 0.79, 0, self.k_const)(1, data.tissues_n2)
+        self.assertEqual(expected, v.tissues_n2)
+
+
+    def test_exp_cache_reset_k_const(self):
+        """
+        Test resetting exponential function values cache on k constants change
+        """
+        m = self.model
+        data = m.init(1.0)
+        m.load(4, 1, AIR, 0, data)
+
+        m.n2_k_const = tuple(k * 2 for k in m.n2_k_const)
+        v = m.load(4, 1, AIR, 0, data)
+
+        loader = m._tissue_loader(4, 0.79, 0, m.n2_k_const)
+        self.assertEqual(loader(1, data.tissues_n2), v.tissues_n2)
+
+
+    def test_exp_cache_lru(self):
+        """
+        Test evicting least recently used exponential function values
+        """
+        m = self.model
+        m.EXP_CACHE_SIZE = 2
+        data = m.init(1.0)
+        m._exp = mock.MagicMock(side_effect=m._exp)
+
+        m.load(4, 1, AIR, 0, data)
+        m.load(4, 2, AIR, 0, data)
+        m.load(4, 1, AIR, 0, data) # time 1 used recently
+        m.load(4, 3, AIR, 0, data) # time 2 evicted
+        self.assertEqual(96, m._exp.call_count)
+
+        m.load(4, 1, AIR, 0, data)
+        self.assertEqual(96, m._exp.call_count) # cached values used
+
+        m.load(4, 2, AIR, 0, data)
+        self.assertEqual(128, m._exp.call_count)
+
+
 
 class GradientFactorLimitTestCase(unittest.TestCase):
     """
@@ -101,6 +199,14 @@ class GradientFactorLimitTestCase(unittest.TestCase):
         self.assertAlmostEqual(1.020997, v, 6)
 
 
+    def test_gf_pressure(self):
+        """
+        Test maximum tissue pressure allowed by gradient factor limit
+        """
+        v = _eq_gf_pressure(0.3, 2.140137, 1.1696, 0.5578)
+        self.assertAlmostEqual(3.0, v, 6)
+
+
     def test_gf_limit_tx1845_30(self):
         """
         Test 30% gradient factor limit for trimix
@@ -128,10 +234,9 @@ class ZH_L16_GFTestCase(unittest.TestCase):
         """
         m = ZH_L16B_GF()
         data = m.init(1.013)
-        tissues = data.tissues
-        self.assertEquals(m.NUM_COMPARTMENTS, len(tissues))
-        expected = tuple([(0.75092706, 0.0)] * m.NUM_COMPARTMENTS)
-        self.assertEquals(expected, tissues)
+        n = m.NUM_COMPARTMENTS
+        self.assertEquals((0.75092706,) * n, data.tissues_n2)
+        self.assertEquals((0.0,) * n, data.tissues_he)
 
 
     def test_tissues_load(self):
@@ -141,12 +246,154 @@ class ZH_L16_GFTestCase(unittest.TestCase):
         m = ZH_L16B_GF()
         n = m.NUM_COMPARTMENTS
 
-        data = Data([(0.79, 0.0)] * n, None)
+        data = Data((0.79,) * n, (0.0,) * n, None)
         result = m.load(4, 1, AIR, -1, data)
 
-        tissues = result.tissues
-        self.assertTrue(all(v[0] > 0.79 for v in tissues), tissues)
-        self.assertTrue(all(v[1] == 0 for v in tissues), tissues)
+        tissues = result.tissues_n2
+        self.assertTrue(all(v > 0.79 for v in tissues), tissues)
+        tissues = result.tissues_he
+        self.assertTrue(all(v == 0 for v in tissues), tissues)
+
+
+    def test_loader(self):
+        """
+        Test tissue gas loading with loader created for depth and gas mix
+        """
+        m = ZH_L16B_GF()
+        data = m.init(1.0)
+        data = m.load(5.0, 30, AIR, 0, data)
+
+        f = m.loader(3.1, AIR, 0)
+        self.assertEqual(m.load(3.1, 5, AIR, 0, data), f(5, data))
+        self.assertEqual(m.load(3.1, 9, AIR, 0, data), f(9, data))
+
+
+    def test_ceiling_checker(self):
+        """
+        Test checking ascent ceiling limit after tissue gas loading
+        """
+        m = ZH_L16B_GF()
+        data = m.init(1.0)
+        data = m.load(5.0, 30, AIR, 0, data)
+
+        f = m.loader(3.1, AIR, 0)
+        check = m.ceiling_checker(3.1, AIR, 0, 2.8, 0.3)
+        for t in range(1, 30):
+            expected = m.within_ceiling_limit(2.8, f(t, data), 0.3)
+            self.assertEqual(expected, check(t, data), t)
+
+        # test precondition - both results are tested
+        self.assertFalse(check(1, data))
+        self.assertTrue(check(29, data))
+
+
+    def test_ceiling_checker_ascent(self):
+        """
+        Test checking ascent ceiling limit after tissue gas loading (ascent)
+        """
+        m = ZH_L16B_GF()
+        data = m.init(1.0)
+        data = m.load(5.0, 30, AIR, 0, data)
+
+        f = m.loader(5.0, AIR, -1.0)
+        check = m.ceiling_checker(5.0, AIR, -1.0, 2.8, 0.3)
+        for t in (0.5, 1, 1.5, 2):
+            expected = m.within_ceiling_limit(2.8, f(t, data), 0.3)
+            self.assertEqual(expected, check(t, data), t)
+
+
+    def test_ceiling_checker_trimix(self):
+        """
+        Test checking ascent ceiling limit after tissue gas loading (trimix)
+        """
+        m = ZH_L16B_GF()
+        gas = GasMix(0, 18, 37, 45)
+        data = m.init(1.0)
+        data = m.load(7.0, 40, gas, 0, data)
+
+        f = m.loader(4.0, gas, 0)
+        check = m.ceiling_checker(4.0, gas, 0, 3.4, 0.4)
+        for t in range(1, 60):
+            expected = m.within_ceiling_limit(3.4, f(t, data), 0.4)
+            self.assertEqual(expected, check(t, data), t)
+
+        # test precondition - both results are tested
+        self.assertFalse(check(1, data))
+        self.assertTrue(check(59, data))
+
+
+    def test_within_ceiling_limit(self):
+        """
+        Test checking if pressure is within ascent ceiling limit
+        """
+        m = ZH_L16B_GF()
+        data = m.init(1.0)
+        data = m.load(5.0, 30, AIR, 0, data)
+        limit = m.ceiling_limit(data, 0.3)
+
+        self.assertTrue(m.within_ceiling_limit(limit, data, 0.3))
+        self.assertTrue(m.within_ceiling_limit(limit + 0.01, data, 0.3))
+        self.assertFalse(m.within_ceiling_limit(limit - 0.01, data, 0.3))
+
+
+    def test_within_ceiling_limit_gf(self):
+        """
+        Test checking if pressure is within ascent ceiling limit (default gf)
+        """
+        m = ZH_L16B_GF()
+        m.gf_low = 0.2
+        data = m.init(1.0)
+        data = m.load(5.0, 30, AIR, 0, data)
+        limit = m.ceiling_limit(data)
+
+        self.assertTrue(m.within_ceiling_limit(limit, data))
+        self.assertFalse(m.within_ceiling_limit(limit - 0.01, data))
+
+
+    def test_ceiling_time(self):
+        """
+        Test estimation of time to reach ascent ceiling limit at constant depth
+        """
+        m = ZH_L16B_GF()
+        data = m.init(1.0)
+        data = m.load(5.0, 30, AIR, 0, data)
+        self.assertTrue(m.ceiling_limit(data, 0.3) > 2.8) # test precondition
+
+        t = m.ceiling_time(3.1, AIR, data, 2.8, 0.3)
+        data = m.load(3.1, t, AIR, 0, data)
+        self.assertAlmostEqual(2.8, m.ceiling_limit(data, 0.3))
+
+
+    def test_ceiling_time_reached(self):
+        """
+        Test estimation of time to reach ascent ceiling limit when limit not breached
+        """
+        m = ZH_L16B_GF()
+        data = m.init(1.0)
+        t = m.ceiling_time(3.1, AIR, data, 2.8, 0.3)
+        self.assertEqual(0, t)
+
+
+    def test_ceiling_time_unreachable(self):
+        """
+        Test estimation of time to reach ascent ceiling limit when limit cannot be reached
+        """
+        m = ZH_L16B_GF()
+        data = m.init(1.0)
+        data = m.load(5.0, 30, AIR, 0, data)
+        t = m.ceiling_time(2.2, AIR, data, 1.0, 0.9)
+        self.assertIsNone(t)
+
+
+    def test_ceiling_time_trimix(self):
+        """
+        Test estimation of time to reach ascent ceiling limit for trimix
+        """
+        m = ZH_L16B_GF()
+        data = m.init(1.0)
+        gas = GasMix(0, 21, 44, 35)
+        t = m.ceiling_time(3.1, gas, data, 2.8, 0.3)
+        self.assertIsNone(t)
 
 
     def test_exp(self):
@@ -158,75 +405,72 @@ class ZH_L16_GFTestCase(unittest.TestCase):
         self.assertAlmostEqual(0.88692043, v)
 
 
-    @mock.patch('decotengu.model.eq_gf_limit')
-    def test_ceiling_limit(self, f):
+    def test_ceiling_limit(self):
         """
         Test calculation of pressure limit (default gf)
         """
         m = ZH_L16B_GF()
-        data = Data(
-            ((1.5, 0.0), (2.5, 0.), (2.0, 0.0), (2.9, 0.0), (2.6, 0.0)),
-            0.3
-        )
-        limit = (1.0, 2.0, 1.5, 2.4, 2.1)
-        f.side_effect = limit
+        data = Data((1.5, 2.5, 2.0, 2.9, 2.6), (0.0,) * 5, 0.3)
 
         m.gf_low = 0.1
 
         v = m.ceiling_limit(data)
-        self.assertEquals(2.4, v)
+        self.assertEquals(max(m.gf_limit(0.1, data)), v)
 
 
-    @mock.patch('decotengu.model.eq_gf_limit')
-    def test_ceiling_limit_gf(self, f):
+    def test_ceiling_limit_gf(self):
         """
         Test calculation of pressure limit (with gf)
         """
         m = ZH_L16B_GF()
-        data = Data(
-            ((1.5, 0.0), (2.5, 0.), (2.0, 0.0), (2.9, 0.0), (2.6, 0.0)),
-            0.3
-        )
-        limit = (1.0, 2.0, 1.5, 2.4, 2.1)
-        f.side_effect = limit
+        data = Data((1.5, 2.5, 2.0, 2.9, 2.6), (0.0,) * 5, 0.3)
 
         v = m.ceiling_limit(data, gf=0.2)
-        self.assertEquals(2.4, v)
+        self.assertEquals(max(m.gf_limit(0.2, data)), v)
 
 
-    @mock.patch('decotengu.model.eq_gf_limit')
-    def test_gf_limit(self, f):
+    def test_ceiling_limit_trimix(self):
+        """
+        Test calculation of pressure limit for trimix gas loading
+        """
+        m = ZH_L16B_GF()
+        data = Data((1.5, 2.5, 2.0, 2.9, 2.6), (0.5, 0.1, 0.7, 0.2, 0.6), 0.3)
+
+        v = m.ceiling_limit(data, gf=0.4)
+        self.assertEquals(max(m.gf_limit(0.4, data)), v)
+
+
+    def test_gf_limit(self):
         """
         Test deco model gradient factor limit calculation
 
-        Check if appropriate parameters are passed from ZH_L16B_GF.gf_limit
-        to eq_gf_limit function.
+        Check if appropriate parameters are used by ZH_L16B_GF.gf_limit
+        to calculate limit with eq_gf_limit function.
         """
-        f.side_effect = list(range(1, 17))
         m = ZH_L16B_GF()
-        data = Data(
-            tuple((v, 0.1) for v in range(1, 17)),
-            0.3
-        )
+        data = Data(tuple(range(1, 17)), (0.1,) * 16, 0.3)
 
         v = m.gf_limit(0.3, data)
-        self.assertEquals(v, tuple(range(1, 17)))
-        self.assertEquals(m.NUM_COMPARTMENTS, f.call_count)
-
-        result = tuple(t[0][0] for t in f.call_args_list)
-        self.assertEquals(tuple([0.3]) * 16, result)
-        result = tuple(t[0][1] for t in f.call_args_list)
-        self.assertEquals(tuple(range(1, 17)), result)
-        result = tuple(t[0][2] for t in f.call_args_list)
-        self.assertEquals(tuple([0.1]) * 16, result)
-        result = tuple(t[0][3] for t in f.call_args_list)
-        self.assertEquals(m.N2_A, result)
-        result = tuple(t[0][4] for t in f.call_args_list)
-        self.assertEquals(m.N2_B, result)
-        result = tuple(t[0][5] for t in f.call_args_list)
-        self.assertEquals(m.HE_A, result)
-        result = tuple(t[0][6] for t in f.call_args_list)
-        self.assertEquals(m.HE_B, result)
+        self.assertEquals(m.NUM_COMPARTMENTS, len(v))
+
+        params = zip(
+            data.tissues_n2, data.tissues_he, m.N2_A, m.N2_B, m.HE_A, m.HE_B
+        )
+        expected = tuple(eq_gf_limit(0.3, *p) for p in params)
+        for v1, v2 in zip(expected, v):
+            self.assertAlmostEqual(v1, v2)
+
+
+    def test_gf_limits(self):
+        """
+        Test deco model gradient factor limit calculation for multiple gradient factor values
+        """
+        m = ZH_L16B_GF()
+        data = Data(tuple(range(1, 17)), (0.1,) * 16, 0.3)
+
+        tl, tm = m.gf_limits((0.3, 1), data)
+        self.assertEquals(m.gf_limit(0.3, data), tl)
+        self.assertEquals(m.gf_limit(1, data), tm)
 
 
 
@@ -264,6 +508,43 @@ class DecoModelValidatorTestCase(unittest.TestCase):
         model.ceiling_limit.assert_called_once_with(s.data, 0.3)
 
 
+    def test_ceiling_limit_all(self):
+        """
+        Test ceiling limit validator checking all steps by default
+        """
+        engine = _engine()
+        model = engine.model
+        model.ceiling_limit = mock.MagicMock(return_value=2.0)
+
+        validator = DecoModelValidator(engine)()
+        validator.send(_step(Phase.START, 2.0, 0))
+        validator.send(_step(Phase.DESCENT, 2.2, 1))
+        validator.send(_step(Phase.CONST, 2.2, 3))
+        self.assertEqual(3, model.ceiling_limit.call_count)
+
+        s = _step(Phase.CONST, 1.9, 4)
+        self.assertRaises(EngineError, validator.send, s)
+
+
+    def test_ceiling_limit_phase(self):
+        """
+        Test ceiling limit validator skipping steps before ascent
+        """
+        engine = _engine()
+        model = engine.model
+        model.ceiling_limit = mock.MagicMock(return_value=2.0)
+
+        validator = DecoModelValidator(engine, ascent_only=True)()
+        validator.send(_step(Phase.START, 1.0, 0))
+        validator.send(_step(Phase.DESCENT, 2.2, 1))
+        validator.send(_step(Phase.CONST, 2.2, 3))
+        self.assertFalse(model.ceiling_limit.called)
+
+        s = _step(Phase.ASCENT, 2.1, 4)
+        validator.send(s)
+        model.ceiling_limit.assert_called_once_with(s.data, 0.3)
+
+
     def test_first_stop_at_ceiling(self):
         """
         Test first stop at deco ceiling
@@ -283,6 +564,44 @@ class DecoModelValidatorTestCase(unittest.TestCase):
         engine.model.ceiling_limit.assert_called_once_with(s1.data)
 
 
+    def test_first_stop_at_ceiling_limit(self):
+        """
+        Test first stop at deco ceiling reusing ceiling limit
+        """
+        engine = _engine()
+        model = engine.model
+        validator = DecoModelValidator(engine)
+
+        s1 = _step(Phase.ASCENT, 3.1, 25)
+        s2 = _step(Phase.DECO_STOP, 3.1, 26)
+
+        model.ceiling_limit = mock.MagicMock(return_value=2.79)
+
+        # ascent to 18m should not be possible
+        validator._first_stop_at_ceiling(s1, s2, 2.81)
+        self.assertTrue(validator._first_stop_checked)
+        self.assertFalse(model.ceiling_limit.called)
+
+
+    def test_first_stop_at_ceiling_limit_gf(self):
+        """
+        Test first stop at deco ceiling not reusing ceiling limit for gf
+        """
+        engine = _engine()
+        model = engine.model
+        validator = DecoModelValidator(engine)
+
+        s1 = _step(Phase.ASCENT, 3.1, 25)
+        s1.data.gf = 0.4
+        s2 = _step(Phase.DECO_STOP, 3.1, 26)
+
+        model.ceiling_limit = mock.MagicMock(return_value=2.81)
+
+        validator._first_stop_at_ceiling(s1, s2, 2.79)
+        self.assertTrue(validator._first_stop_checked)
+        model.ceiling_limit.assert_called_once_with(s1.data)
+
+
     def test_first_stop_at_ceiling_error(self):
         """
         Test first stop at deco ceiling error
@@ -127,6 +127,9 @@ class CSVWriterTestCase(unittest.TestCase):
         self.assertTrue(st[0].startswith('depth,time,pressure,'))
         self.assertTrue(st[1].endswith('descent\r'), st[1])
         self.assertTrue(st[4].endswith('const\r'), st[4])
+        self.assertEquals(
+            '2,5,3.1,21,79,0,1,1.5,0.96,0.3,0.99,const\r', st[4]
+        )
 
 
 # vim: sw=4:et:ai
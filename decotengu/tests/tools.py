@@ -43,14 +43,14 @@ def _engine(air=False):
     engine.surface_pressure = 1.0
     engine._meter_to_bar = 0.1
     engine._p3m = 0.3
+    engine._update_rates()
     if air:
         engine.add_gas(0, 21)
     return engine
 
 
 def _data(gf, *pressure):
-    tp = tuple((v, 0.0) for v in pressure)
-    return Data(tp, gf)
+    return Data(tuple(pressure), (0.0,) * len(pressure), gf)
 
 
 # vim: sw=4:et:ai